@@ -1,21 +1,42 @@
 """The Jebao integration."""
 from __future__ import annotations
 
-from datetime import timedelta
 import logging
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING
 
-from jebao import JebaoError, MDP20000Device, discover_devices
+from jebao import JebaoError, MDP20000Device
 
-from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY, ConfigEntry
-from homeassistant.const import CONF_HOST, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .broker import ConnectStats, async_get_broker
+from .burst import async_get_burst_poller
+from .const import (
+    CONF_KEEP_PROGRAM_MODE,
+    CONF_MODEL,
+    DATA_DISCOVERY,
+    DEFAULT_KEEP_PROGRAM_MODE,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MODEL_MD44,
+)
+from .coordinator import JebaoDataUpdateCoordinator, JebaoMD44Coordinator
+from .counters import JebaoRuntimeCounters, async_remove_counters
+from .discovery import JebaoDiscoveryScheduler
+from .index import async_get_index
+from .md44 import MD44Device
+from .services import async_setup_services
+from .statistics import JebaoStatistics
+from .telemetry import async_get_telemetry
+from .throttle import JebaoThrottle
+from .trace import async_get_traces
+from .websocket_api import async_setup_websocket
 
 if TYPE_CHECKING:
     from homeassistant.helpers.entity import Entity
@@ -30,68 +51,39 @@ PLATFORMS: list[Platform] = [
     Platform.SENSOR,
 ]
 
-# Periodic background discovery interval (UDP broadcast scan)
-DISCOVERY_INTERVAL = timedelta(minutes=5)
+# MD-4.4 dosers are read-only and their status is not decoded yet:
+# diagnostic sensors only
+MD44_PLATFORMS: list[Platform] = [
+    Platform.SENSOR,
+]
+
+
+def _platforms(entry: ConfigEntry) -> list[Platform]:
+    """Return the platforms for the entry's pump model."""
+    if entry.data.get(CONF_MODEL) == MODEL_MD44:
+        return MD44_PLATFORMS
+    return PLATFORMS
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up periodic background discovery for Jebao pumps."""
+    async_get_index(hass)
 
-    async def _periodic_discovery(_now=None) -> None:
-        try:
-            devices = await discover_devices(timeout=5.0)
-        except Exception as err:  # pylint: disable=broad-except
-            _LOGGER.debug("Periodic discovery failed: %s", err)
-            return
-
-        entries = hass.config_entries.async_entries(DOMAIN)
-        entries_by_id = {entry.unique_id: entry for entry in entries}
-
-        for device in devices:
-            if not device.is_mdp20000:
-                continue
-
-            existing = entries_by_id.get(device.device_id)
-            if existing is not None:
-                # Backfill missing MAC / update IP if it drifted (DHCP discovery is the
-                # preferred IP-recovery path, but periodic scan is a belt-and-suspenders).
-                updates: dict[str, Any] = {}
-                if not existing.data.get("mac_address") and device.mac_address:
-                    updates["mac_address"] = device.mac_address
-                if existing.data.get(CONF_HOST) != device.ip_address:
-                    updates[CONF_HOST] = device.ip_address
-                if updates:
-                    _LOGGER.info(
-                        "Updating Jebao entry %s from periodic discovery: %s",
-                        existing.title,
-                        updates,
-                    )
-                    hass.config_entries.async_update_entry(
-                        existing, data={**existing.data, **updates}
-                    )
-                continue
-
-            # New, unconfigured pump - kick off a discovery flow so it appears
-            # in Settings -> Devices & Services as "Discovered".
-            hass.async_create_task(
-                hass.config_entries.flow.async_init(
-                    DOMAIN,
-                    context={"source": SOURCE_INTEGRATION_DISCOVERY},
-                    data={
-                        "device_id": device.device_id,
-                        "ip": device.ip_address,
-                        "model": device.model,
-                        "mac_address": device.mac_address,
-                        "firmware_version": device.firmware_version,
-                    },
-                )
-            )
-
-    # Fire once shortly after startup, then on the regular interval.
-    hass.async_create_background_task(
-        _periodic_discovery(), "jebao_initial_discovery"
-    )
-    async_track_time_interval(hass, _periodic_discovery, DISCOVERY_INTERVAL)
+    scheduler = JebaoDiscoveryScheduler(hass)
+    hass.data.setdefault(DOMAIN, {})[DATA_DISCOVERY] = scheduler
+
+    async def _async_stop(_event: Event) -> None:
+        # Entries are not unloaded on stop, so close every pump here, all at
+        # once and bounded by one deadline instead of one pump at a time.
+        scheduler.async_stop()
+        await async_get_broker(hass).async_shutdown()
+
+    # Fire once shortly after startup; later scans schedule themselves.
+    scheduler.async_start()
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+
+    async_setup_services(hass)
+    async_setup_websocket(hass)
     return True
 
 
@@ -105,55 +97,231 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     _LOGGER.info("Setting up Jebao device at %s", host)
 
+    if model == MODEL_MD44:
+        return await _async_setup_md44_entry(hass, entry)
+
     # Create device instance
     device = MDP20000Device(host=host, device_id=device_id)
+    broker = async_get_broker(hass)
+    _async_resume_trace(hass, entry, device)
+    throttle = JebaoThrottle.from_entry(entry)
+    throttle.async_attach(device)
 
     try:
         # Connect to device
-        await device.connect()
-
-        # Ensure manual mode (exit Program mode if active)
-        await device.ensure_manual_mode()
-
+        await broker.async_connect(device, timeout=5.0)
         _LOGGER.info("Successfully connected to Jebao device at %s", host)
 
     except JebaoError as err:
         _LOGGER.error("Failed to connect to Jebao device at %s: %s", host, err)
-        await device.disconnect()
+        await broker.async_disconnect(device)
         raise ConfigEntryNotReady(f"Failed to connect: {err}") from err
 
+    # Share the live session with the config flow, diagnostics, etc.
+    broker.async_register(device)
+
+    # Create a single coordinator shared by every platform of this entry
+    coordinator = JebaoDataUpdateCoordinator(
+        hass,
+        device,
+        entry,
+        device_id,
+        entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL),
+    )
+
+    if entry.options.get(CONF_KEEP_PROGRAM_MODE, DEFAULT_KEEP_PROGRAM_MODE):
+        # The pump runs its own on-device schedule; only monitor it
+        _LOGGER.info(
+            "Leaving Jebao device at %s in its current mode (Program mode kept)",
+            host,
+        )
+    else:
+        # Exit Program mode if active; sent by the first poll, through the
+        # coordinator's request policy
+        await coordinator.async_set_desired(manual_mode=True)
+
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except ConfigEntryNotReady:
+        broker.async_unregister(device)
+        await broker.async_disconnect(device)
+        raise
+
+    if "recorder" in hass.config.components:
+        # Hourly long-term statistics, built from the coordinator's polls
+        statistics = JebaoStatistics(hass, coordinator)
+        await statistics.async_start()
+        entry.async_on_unload(coordinator.async_add_listener(statistics.async_update))
+        entry.async_on_unload(statistics.async_flush)
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, statistics.async_flush)
+        )
+
+    # Runtime counters (on-hours, cycles, feeds), persisted across restarts
+    counters = JebaoRuntimeCounters(hass, coordinator)
+    await counters.async_load()
+    counters.async_update()
+    entry.async_on_unload(coordinator.async_add_listener(counters.async_update))
+    entry.async_on_unload(counters.async_save)
+
+    # Live samples for websocket subscribers (and their ring buffer)
+    entry.async_on_unload(async_get_telemetry(hass).async_add_coordinator(coordinator))
+
     # Store device instance
+    async_get_index(hass).async_set_device(entry.entry_id, device)
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "device": device,
+        "coordinator": coordinator,
+        "counters": counters,
+        "throttle": throttle,
         "host": host,
         "device_id": device_id,
         "model": model,
         "mac_address": mac_address,
         "firmware_version": firmware_version,
+        "options": dict(entry.options),
     }
 
     # Forward setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    return True
+
+
+async def _async_setup_md44_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up an MD-4.4 dosing pump (monitoring only)."""
+    host = entry.data[CONF_HOST]
+    device_id = entry.data.get("device_id")
+
+    device = MD44Device(host=host, device_id=device_id)
+    broker = async_get_broker(hass)
+    _async_resume_trace(hass, entry, device)
+    throttle = JebaoThrottle.from_entry(entry)
+    throttle.async_attach(device)
+
+    try:
+        await broker.async_connect(device, timeout=5.0)
+    except JebaoError as err:
+        _LOGGER.error("Failed to connect to Jebao device at %s: %s", host, err)
+        await broker.async_disconnect(device)
+        raise ConfigEntryNotReady(f"Failed to connect: {err}") from err
+
+    broker.async_register(device)
+    _async_remove_md44_channel_entities(hass, entry)
+
+    # One status read per poll, kept raw for diagnostics
+    coordinator = JebaoMD44Coordinator(
+        hass,
+        device,
+        entry,
+        device_id,
+        entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL),
+    )
+
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except ConfigEntryNotReady:
+        broker.async_unregister(device)
+        await broker.async_disconnect(device)
+        raise
+
+    async_get_index(hass).async_set_device(entry.entry_id, device)
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = {
+        "device": device,
+        "coordinator": coordinator,
+        "throttle": throttle,
+        "host": host,
+        "device_id": device_id,
+        "model": MODEL_MD44,
+        "mac_address": entry.data.get("mac_address"),
+        "firmware_version": entry.data.get("firmware_version"),
+        "options": dict(entry.options),
+    }
+
+    await hass.config_entries.async_forward_entry_setups(entry, MD44_PLATFORMS)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+@callback
+def _async_remove_md44_channel_entities(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the per-channel entities earlier versions decoded from a guess."""
+    registry = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if "_channel_" in entity_entry.unique_id:
+            registry.async_remove(entity_entry.entity_id)
+
+
+@callback
+def _async_resume_trace(
+    hass: HomeAssistant, entry: ConfigEntry, device: MDP20000Device | MD44Device
+) -> None:
+    """Keep tracing across a reload (before connecting, to capture the login)."""
+    trace = async_get_traces(hass).get(entry.entry_id)
+    if trace is not None and trace.enabled:
+        trace.async_attach(device)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change.
+
+    Data-only updates (IP or MAC backfill) are handled in place and don't
+    need a reload.
+    """
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data is not None and data["options"] != dict(entry.options):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    start = time.monotonic()
+
+    # Stop any fast-poll burst first so it doesn't race the disconnect
+    async_get_burst_poller(hass).async_cancel(entry.entry_id)
+
     # Unload platforms
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, _platforms(entry)
+    )
 
     if unload_ok:
-        # Disconnect device
+        # Disconnect device (bounded, so a dead pump can't stall a reload)
         data = hass.data[DOMAIN].pop(entry.entry_id)
-        device: MDP20000Device = data["device"]
-        await device.disconnect()
-        _LOGGER.info("Disconnected from Jebao device at %s", data["host"])
+        device: MDP20000Device | MD44Device = data["device"]
+        broker = async_get_broker(hass)
+        broker.async_unregister(device)
+        async_get_index(hass).async_set_device(entry.entry_id, None)
+        await broker.async_disconnect(device)
+        data["throttle"].async_detach()
+
+        duration = time.monotonic() - start
+        broker.stats.setdefault(device.host, ConnectStats()).last_unload_duration = (
+            duration
+        )
+        _LOGGER.info(
+            "Disconnected from Jebao device at %s (unload took %.2fs)",
+            data["host"],
+            duration,
+        )
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete data stored for a removed config entry."""
+    await async_remove_counters(hass, entry.entry_id)
+    trace = async_get_traces(hass).pop(entry.entry_id, None)
+    if trace is not None:
+        trace.async_detach()
+
+
 def get_device_info(entry: ConfigEntry) -> DeviceInfo:
     """Get device info for device registry."""
     device_id = entry.data.get("device_id", "unknown")
@@ -0,0 +1,178 @@
+"""Availability hysteresis for Jebao pumps.
+
+A failed poll used to make every entity of the pump unavailable and the
+next good one brought them back, so a lossy 2.4 GHz link flipped all of
+them (recorder rows, automations, "unreachable" triggers) on every lost
+frame. The coordinators now hold a failed poll: entities keep the last
+values read and the pump is flagged stale, until either a number of polls
+in a row have failed or the last good read is older than the staleness
+deadline. Only then do the entities go unavailable.
+
+Coming back needs a confirmed good read: the first successful poll after
+an outage is followed straight away by a second status read, and the
+entities return only if that one succeeds too, so a single reply slipping
+through a dead link does not flip them back and forth.
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+import logging
+import time
+from typing import Any, Optional
+
+from jebao import JebaoError
+
+from homeassistant.config_entries import ConfigEntry
+
+from .const import (
+    CONF_FAILURE_THRESHOLD,
+    CONF_STALE_TIMEOUT,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_STALE_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class AvailabilityStats:
+    """Outcome counts of one pump's availability."""
+
+    # Failed polls held with the last values
+    held_failures: int = 0
+    # Runs of held failures (the pump turned stale)
+    stale_episodes: int = 0
+    # Times the entities turned unavailable
+    outages: int = 0
+    # Good reads after an outage that the confirming read did not back up
+    unconfirmed_recoveries: int = 0
+
+
+class JebaoAvailability:
+    """Failure threshold and staleness deadline for one pump."""
+
+    def __init__(
+        self,
+        title: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        stale_timeout: float = DEFAULT_STALE_TIMEOUT,
+    ) -> None:
+        """Initialize availability.
+
+        Args:
+            title: Pump name for logs
+            failure_threshold: Polls in a row that may fail before the
+                entities turn unavailable (1 turns them unavailable at once)
+            stale_timeout: Seconds since the last good read after which a
+                failed poll turns the entities unavailable
+        """
+        self.title = title
+        self.failure_threshold = failure_threshold
+        self.stale_timeout = stale_timeout
+        self.stats = AvailabilityStats()
+        self.consecutive_failures = 0
+        self.stale = False
+        self.available = True
+        self._last_good: Optional[float] = None
+
+    @classmethod
+    def from_entry(cls, entry: ConfigEntry) -> JebaoAvailability:
+        """Create the hysteresis configured in an entry's options."""
+        return cls(
+            entry.title,
+            entry.options.get(CONF_FAILURE_THRESHOLD, DEFAULT_FAILURE_THRESHOLD),
+            entry.options.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT),
+        )
+
+    @property
+    def flaps(self) -> int:
+        """Return how often the pump has been stale or unavailable."""
+        return self.stats.stale_episodes + self.stats.outages
+
+    @property
+    def last_good_age(self) -> Optional[float]:
+        """Return the seconds since the last good read."""
+        if self._last_good is None:
+            return None
+        return time.monotonic() - self._last_good
+
+    def hold(self, err: Exception) -> bool:
+        """Record a failed poll; return True to keep the last values.
+
+        Returns False once the threshold or the deadline is reached (or
+        before the first good read), and the poll should fail.
+        """
+        self.consecutive_failures += 1
+        age = self.last_good_age
+        if (
+            self.available
+            and age is not None
+            and age < self.stale_timeout
+            and self.consecutive_failures < self.failure_threshold
+        ):
+            self.stats.held_failures += 1
+            if not self.stale:
+                self.stale = True
+                self.stats.stale_episodes += 1
+                _LOGGER.info(
+                    "%s did not answer (%s); keeping the last values for now",
+                    self.title,
+                    err,
+                )
+            return True
+
+        if self.available:
+            self.available = False
+            self.stats.outages += 1
+            if self.stale:
+                _LOGGER.warning(
+                    "%s unavailable after %d failed poll(s), last good read %.0f s ago",
+                    self.title,
+                    self.consecutive_failures,
+                    age if age is not None else 0.0,
+                )
+        self.stale = False
+        return False
+
+    async def async_confirm(self, read: Callable[[], Awaitable[Any]]) -> None:
+        """After an outage, read again before the entities come back.
+
+        Raises:
+            JebaoError: The confirming read failed
+        """
+        if self.available:
+            return
+        try:
+            await read()
+        except JebaoError:
+            self.stats.unconfirmed_recoveries += 1
+            raise
+
+    def good(self) -> None:
+        """Record a good (and, after an outage, confirmed) read."""
+        if not self.available:
+            _LOGGER.info("%s is answering again", self.title)
+        elif self.stale:
+            _LOGGER.debug(
+                "%s answered again after %d failed poll(s)",
+                self.title,
+                self.consecutive_failures,
+            )
+        self.available = True
+        self.stale = False
+        self.consecutive_failures = 0
+        self._last_good = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the configuration and state for diagnostics."""
+        age = self.last_good_age
+        return {
+            "failure_threshold": self.failure_threshold,
+            "stale_timeout": self.stale_timeout,
+            "available": self.available,
+            "stale": self.stale,
+            "consecutive_failures": self.consecutive_failures,
+            "last_good_read_age": round(age, 1) if age is not None else None,
+            **asdict(self.stats),
+        }
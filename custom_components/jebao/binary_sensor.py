@@ -25,24 +25,13 @@ async def async_setup_entry(
 ) -> None:
     """Set up Jebao binary sensors from config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    device = data["device"]
     device_id = data["device_id"]
     model = data["model"]
     host = data["host"]
     mac_address = data.get("mac_address")
     firmware_version = data.get("firmware_version")
 
-    # Get or create coordinator
-    if "coordinator" not in data:
-        scan_interval = entry.options.get("scan_interval")
-        if scan_interval:
-            coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id, scan_interval)
-        else:
-            coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id)
-        await coordinator.async_config_entry_first_refresh()
-        data["coordinator"] = coordinator
-    else:
-        coordinator = data["coordinator"]
+    coordinator: JebaoDataUpdateCoordinator = data["coordinator"]
 
     # Create binary sensors
     async_add_entities(
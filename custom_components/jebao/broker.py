@@ -0,0 +1,212 @@
+"""Connection broker for Jebao pumps.
+
+Many pumps only accept a single TCP client. The broker knows which pump
+sessions are owned by loaded config entries, hands those out to anything
+else that needs to talk to the pump (config flow validation, diagnostics),
+and only opens a new socket for hosts nobody owns yet.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+import logging
+import time
+from typing import Any, Optional
+
+from jebao import MODEL_MD44, JebaoDevice, JebaoError, MDP20000Device
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_BROKER, DOMAIN
+from .md44 import MD44Device
+
+_LOGGER = logging.getLogger(__name__)
+
+# Timeout for sockets the broker opens itself (hosts without a live session)
+BROKER_CONNECT_TIMEOUT = 10.0
+
+# Longest a single disconnect may take before the socket is abandoned
+DISCONNECT_TIMEOUT = 5.0
+# Overall deadline for disconnecting every pump when Home Assistant stops
+SHUTDOWN_TIMEOUT = 10.0
+
+
+def create_device(
+    host: str, device_id: Optional[str] = None, model: Optional[str] = None
+) -> JebaoDevice:
+    """Create the device class for a pump model (MDP-20000 if unknown)."""
+    if model == MODEL_MD44:
+        return MD44Device(host=host, device_id=device_id)
+    return MDP20000Device(host=host, device_id=device_id)
+
+
+@dataclass
+class ConnectStats:
+    """Connect and disconnect statistics for one host."""
+
+    attempts: int = 0
+    failures: int = 0
+    last_duration: Optional[float] = None
+    total_duration: float = 0.0
+    last_error: Optional[str] = None
+    last_disconnect_duration: Optional[float] = None
+    disconnect_timeouts: int = 0
+    last_unload_duration: Optional[float] = None
+
+    @property
+    def average_duration(self) -> Optional[float]:
+        """Return the mean duration of successful connects."""
+        successes = self.attempts - self.failures
+        if successes <= 0:
+            return None
+        return self.total_duration / successes
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {**asdict(self), "average_duration": self.average_duration}
+
+
+class JebaoConnectionBroker:
+    """Share live pump sessions across the integration."""
+
+    def __init__(self) -> None:
+        """Initialize broker."""
+        self._by_host: dict[str, JebaoDevice] = {}
+        self._by_device_id: dict[str, JebaoDevice] = {}
+        self.stats: dict[str, ConnectStats] = {}
+
+    @callback
+    def async_register(self, device: JebaoDevice) -> None:
+        """Register a session owned by a loaded config entry."""
+        self._by_host[device.host] = device
+        if device.device_id:
+            self._by_device_id[device.device_id] = device
+
+    @callback
+    def async_unregister(self, device: JebaoDevice) -> None:
+        """Forget a session when its config entry unloads."""
+        if self._by_host.get(device.host) is device:
+            del self._by_host[device.host]
+        if device.device_id and self._by_device_id.get(device.device_id) is device:
+            del self._by_device_id[device.device_id]
+
+    @callback
+    def async_rehost(self, device: JebaoDevice, old_host: str) -> None:
+        """Move a registered session to the device's new host."""
+        if self._by_host.get(old_host) is device:
+            del self._by_host[old_host]
+        self._by_host[device.host] = device
+
+    @callback
+    def async_get(
+        self, host: Optional[str] = None, device_id: Optional[str] = None
+    ) -> Optional[JebaoDevice]:
+        """Return the owned session for a device_id or host, if any."""
+        if device_id and device_id in self._by_device_id:
+            return self._by_device_id[device_id]
+        if host:
+            return self._by_host.get(host)
+        return None
+
+    async def async_connect(
+        self, device: JebaoDevice, timeout: float = BROKER_CONNECT_TIMEOUT
+    ) -> None:
+        """Connect a device, recording connect-time statistics for its host.
+
+        Raises:
+            JebaoError: Connection failed
+        """
+        stats = self.stats.setdefault(device.host, ConnectStats())
+        stats.attempts += 1
+        start = time.monotonic()
+        try:
+            await device.connect(timeout=timeout)
+        except JebaoError as err:
+            stats.failures += 1
+            stats.last_error = str(err)
+            raise
+        duration = time.monotonic() - start
+        stats.last_duration = duration
+        stats.total_duration += duration
+
+    async def async_disconnect(
+        self, device: JebaoDevice, timeout: float = DISCONNECT_TIMEOUT
+    ) -> None:
+        """Disconnect a device, giving up after the timeout.
+
+        Never raises; a pump that does not close its socket in time is
+        abandoned so it cannot hold up an unload or shutdown.
+        """
+        stats = self.stats.setdefault(device.host, ConnectStats())
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(timeout):
+                await device.disconnect()
+        except TimeoutError:
+            stats.disconnect_timeouts += 1
+            _LOGGER.warning(
+                "Disconnect from %s took longer than %.1fs, abandoning it",
+                device.host,
+                timeout,
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Error disconnecting from %s: %s", device.host, err)
+        stats.last_disconnect_duration = time.monotonic() - start
+
+    async def async_shutdown(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Disconnect every owned session concurrently under one deadline."""
+        devices = set(self._by_host.values())
+        if not devices:
+            return
+        start = time.monotonic()
+        await asyncio.gather(
+            *(self.async_disconnect(device, timeout) for device in devices)
+        )
+        _LOGGER.debug(
+            "Disconnected %d pump(s) in %.2fs",
+            len(devices),
+            time.monotonic() - start,
+        )
+
+    @asynccontextmanager
+    async def async_session(
+        self,
+        host: str,
+        device_id: Optional[str] = None,
+        timeout: float = BROKER_CONNECT_TIMEOUT,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[JebaoDevice]:
+        """Lease a connected session for a pump.
+
+        Owned sessions are reused as-is (and reconnected if they dropped) and
+        stay open afterwards. Unknown hosts get a temporary connection that is
+        closed when the lease ends.
+
+        Raises:
+            JebaoError: Connection failed
+        """
+        owned = self.async_get(host, device_id)
+        if owned is not None:
+            _LOGGER.debug("Reusing live session for %s", host)
+            if not owned.is_connected:
+                await self.async_connect(owned, timeout)
+            yield owned
+            return
+
+        device = create_device(host, device_id, model)
+        try:
+            await self.async_connect(device, timeout)
+            yield device
+        finally:
+            await self.async_disconnect(device)
+
+
+@callback
+def async_get_broker(hass: HomeAssistant) -> JebaoConnectionBroker:
+    """Return the domain-wide connection broker, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_BROKER not in domain_data:
+        domain_data[DATA_BROKER] = JebaoConnectionBroker()
+    return domain_data[DATA_BROKER]
@@ -0,0 +1,161 @@
+"""Short bursts of fast polling for Jebao pumps.
+
+A burst refreshes one pump's coordinator at a high rate for a bounded time
+and then stops on its own; the regular scan interval is untouched. All
+bursts share one polls-per-second budget so many of them at once cannot
+flood the pump network. Bursts run their own timed loop because the
+coordinator's scheduler only works in whole seconds.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DATA_BURST, DOMAIN
+from .coordinator import JebaoDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Polls per second allowed across every running burst
+BURST_BUDGET = 4.0
+# Slowest interval a burst may be stretched to when the budget is tight
+BURST_MAX_INTERVAL = 10.0
+
+
+class JebaoBurstPoller:
+    """Run fast-poll bursts within a global budget."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize burst poller."""
+        self.hass = hass
+        self._bursts: dict[str, tuple[asyncio.Task[dict[str, Any]], float]] = {}
+
+    @property
+    def rate_in_use(self) -> float:
+        """Return the polls per second used by running bursts."""
+        return sum(rate for _, rate in self._bursts.values())
+
+    @callback
+    def async_start_many(
+        self,
+        coordinators: list[JebaoDataUpdateCoordinator],
+        interval: float,
+        duration: float,
+    ) -> list[asyncio.Task[dict[str, Any]]]:
+        """Start bursts on several pumps, all of them or none.
+
+        Bursts already running on these pumps are replaced. The budget left
+        by the other pumps' bursts is shared evenly, stretching the interval
+        if the full rate would exceed it.
+
+        Raises:
+            HomeAssistantError: The budget has no room for every burst
+        """
+        if not coordinators:
+            return []
+        targets = {coordinator.entry.entry_id for coordinator in coordinators}
+        in_use = sum(
+            rate for entry_id, (_, rate) in self._bursts.items() if entry_id not in targets
+        )
+        share = (BURST_BUDGET - in_use) / len(coordinators)
+        if share < 1 / BURST_MAX_INTERVAL:
+            raise HomeAssistantError(
+                f"Fast-poll budget of {BURST_BUDGET:g} polls/s has no room for "
+                f"{len(coordinators)} more burst(s); wait for a running burst to finish"
+            )
+        if 1 / interval > share:
+            _LOGGER.info(
+                "Stretching bursts on %d pump(s) from %.2fs to %.2fs to stay within budget",
+                len(coordinators),
+                interval,
+                1 / share,
+            )
+            interval = 1 / share
+
+        for entry_id in targets:
+            self.async_cancel(entry_id)
+        return [
+            self._async_start(coordinator, interval, duration)
+            for coordinator in coordinators
+        ]
+
+    @callback
+    def _async_start(
+        self,
+        coordinator: JebaoDataUpdateCoordinator,
+        interval: float,
+        duration: float,
+    ) -> asyncio.Task[dict[str, Any]]:
+        """Start one burst whose rate fits the budget."""
+        entry_id = coordinator.entry.entry_id
+        task = self.hass.async_create_background_task(
+            self._async_run(coordinator, interval, duration),
+            f"{DOMAIN} burst poll {coordinator.entry.title}",
+        )
+        self._bursts[entry_id] = (task, 1 / interval)
+        return task
+
+    @callback
+    def async_cancel(self, entry_id: str) -> None:
+        """Stop the burst running on a pump, if any."""
+        burst = self._bursts.pop(entry_id, None)
+        if burst is not None:
+            burst[0].cancel()
+
+    async def _async_run(
+        self,
+        coordinator: JebaoDataUpdateCoordinator,
+        interval: float,
+        duration: float,
+    ) -> dict[str, Any]:
+        """Poll until the duration is up; return what was collected."""
+        start = time.monotonic()
+        deadline = start + duration
+        samples = 0
+        failures = 0
+        _LOGGER.debug(
+            "Burst polling %s every %.2fs for %.0fs",
+            coordinator.entry.title,
+            interval,
+            duration,
+        )
+
+        try:
+            while (poll_start := time.monotonic()) < deadline:
+                await coordinator.async_refresh()
+                if coordinator.last_update_success:
+                    samples += 1
+                else:
+                    failures += 1
+                next_poll = min(poll_start + interval, deadline)
+                await asyncio.sleep(max(0.0, next_poll - time.monotonic()))
+        except asyncio.CancelledError:
+            _LOGGER.debug("Burst on %s cancelled", coordinator.entry.title)
+            raise
+        finally:
+            # Release this burst's share of the budget (unless replaced)
+            entry_id = coordinator.entry.entry_id
+            burst = self._bursts.get(entry_id)
+            if burst is not None and burst[0] is asyncio.current_task():
+                del self._bursts[entry_id]
+
+        return {
+            "samples": samples,
+            "failures": failures,
+            "interval": round(interval, 3),
+            "duration": round(time.monotonic() - start, 1),
+        }
+
+
+@callback
+def async_get_burst_poller(hass: HomeAssistant) -> JebaoBurstPoller:
+    """Return the domain-wide burst poller, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_BURST not in domain_data:
+        domain_data[DATA_BURST] = JebaoBurstPoller(hass)
+    return domain_data[DATA_BURST]
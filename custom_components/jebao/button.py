@@ -24,30 +24,19 @@ async def async_setup_entry(
 ) -> None:
     """Set up Jebao buttons from config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    device = data["device"]
     device_id = data["device_id"]
     model = data["model"]
     host = data["host"]
     mac_address = data.get("mac_address")
     firmware_version = data.get("firmware_version")
 
-    # Get or create coordinator
-    if "coordinator" not in data:
-        scan_interval = entry.options.get("scan_interval")
-        if scan_interval:
-            coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id, scan_interval)
-        else:
-            coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id)
-        await coordinator.async_config_entry_first_refresh()
-        data["coordinator"] = coordinator
-    else:
-        coordinator = data["coordinator"]
+    coordinator: JebaoDataUpdateCoordinator = data["coordinator"]
 
     # Create buttons
     async_add_entities(
         [
-            JebaoStartFeedButton(coordinator, device_id, model, host, device, mac_address, firmware_version),
-            JebaoCancelFeedButton(coordinator, device_id, model, host, device, mac_address, firmware_version),
+            JebaoStartFeedButton(coordinator, device_id, model, host, mac_address, firmware_version),
+            JebaoCancelFeedButton(coordinator, device_id, model, host, mac_address, firmware_version),
         ]
     )
 
@@ -63,13 +52,11 @@ class JebaoStartFeedButton(JebaoEntity, ButtonEntity):
         device_id: str,
         model: str,
         host: str,
-        device,
         mac_address: str | None = None,
         firmware_version: str | None = None,
     ) -> None:
         """Initialize button."""
         super().__init__(coordinator, device_id, model, host, mac_address, firmware_version)
-        self._device = device
         self._attr_unique_id = f"{device_id}_start_feed"
         self._attr_name = "Start feed"
         self._attr_icon = "mdi:fishbowl"
@@ -77,9 +64,8 @@ class JebaoStartFeedButton(JebaoEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Handle button press."""
         try:
-            # Get feed duration from number entity if available
-            # Otherwise use default from device
-            await self._device.start_feed()
+            # Use the duration from the feed duration number entity
+            await self.coordinator.async_start_feed()
             await self.coordinator.async_request_refresh()
             _LOGGER.info("Feed mode started")
 
@@ -98,13 +84,11 @@ class JebaoCancelFeedButton(JebaoEntity, ButtonEntity):
         device_id: str,
         model: str,
         host: str,
-        device,
         mac_address: str | None = None,
         firmware_version: str | None = None,
     ) -> None:
         """Initialize button."""
         super().__init__(coordinator, device_id, model, host, mac_address, firmware_version)
-        self._device = device
         self._attr_unique_id = f"{device_id}_cancel_feed"
         self._attr_name = "Cancel feed"
         self._attr_icon = "mdi:cancel"
@@ -112,7 +96,7 @@ class JebaoCancelFeedButton(JebaoEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Handle button press."""
         try:
-            await self._device.cancel_feed()
+            await self.coordinator.async_cancel_feed()
             await self.coordinator.async_request_refresh()
             _LOGGER.info("Feed mode canceled")
 
@@ -1,60 +1,98 @@
 """Config flow for Jebao integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
-import netifaces
 import voluptuous as vol
-from jebao import JebaoError, MDP20000Device, discover_devices
+from jebao import JebaoError, discover_devices
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.data_entry_flow import FlowResult
+from homeassistant.data_entry_flow import FlowResult, FlowResultType
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import selector
 from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
 
+from .broker import async_get_broker
 from .const import (
     CONF_DEVICE_ID,
     CONF_INTERFACES,
     CONF_MODEL,
+    DATA_BULK_ADD,
     DEFAULT_NAME,
     DOMAIN,
+    MODEL_MD44,
     MODEL_MDP20000,
 )
+from .index import async_get_index
+from .probe import async_probe
 
 _LOGGER = logging.getLogger(__name__)
 
+# Pumps validated at the same time when adding several at once
+BULK_VALIDATE_CONCURRENCY = 4
+
+SUPPORTED_MODELS = (MODEL_MDP20000, MODEL_MD44)
+
+# Flow source for the extra pumps of a bulk add (internal, not user-facing)
+SOURCE_BULK_ADD = "bulk_add"
+
 
 async def validate_connection(hass: HomeAssistant, host: str) -> dict[str, Any]:
     """Validate we can connect to the device.
 
+    Reuses the live session if a loaded entry already owns this host, since
+    many pumps drop their existing client when a second one connects.
+
     Returns:
         Dict with device info on success
 
     Raises:
         JebaoError: Connection or authentication failed
     """
-    device = MDP20000Device(host=host)
-
-    try:
-        await device.connect(timeout=10.0)
+    async with async_get_broker(hass).async_session(host) as device:
         await device.update()
 
         # Get device info
-        info = {
+        return {
             "device_id": device.device_id or "unknown",
             "model": device.model or MODEL_MDP20000,
             "state": device.state.name if device.state else "unknown",
             "mac_address": None,  # Not available from direct connection
-            "firmware_version": None,  # Not currently exposed by device
         }
 
-        return info
 
-    finally:
-        await device.disconnect()
+class UnsupportedModel(HomeAssistantError):
+    """Error to indicate the pump is a model this integration can't drive."""
+
+
+async def identify_device(hass: HomeAssistant, host: str) -> dict[str, Any]:
+    """Identify the pump at a host, preferring the unicast discovery probe.
+
+    The probe answers in milliseconds and includes the MAC address (which
+    DHCP IP recovery needs); a full TCP connection is only tried when the
+    probe gets no reply.
+
+    Returns:
+        Dict with device info on success
+
+    Raises:
+        JebaoError: Neither the probe nor a TCP connection got an answer
+    """
+    device = await async_probe(host)
+    if device is None:
+        _LOGGER.debug("No probe reply from %s, falling back to TCP", host)
+        return await validate_connection(hass, host)
+
+    return {
+        "device_id": device.device_id,
+        "model": device.model,
+        "state": "unknown",
+        "mac_address": device.mac_address,
+    }
 
 
 class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -68,6 +106,8 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._selected_interfaces: list[str] | None = None
         self._discovery_attempted: bool = False
         self._no_devices_reason: str | None = None
+        self._bulk_validated: list[dict[str, Any]] = []
+        self._bulk_results: str = ""
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -98,8 +138,10 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
             return await self.async_step_select_device()
 
-        # Get available network interfaces
-        interfaces = self._get_available_interfaces()
+        # Get available network interfaces (blocking calls into netifaces)
+        interfaces = await self.hass.async_add_executor_job(
+            self._get_available_interfaces
+        )
 
         if not interfaces:
             return await self.async_step_manual()
@@ -135,9 +177,14 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            # User selected a device
-            selected_id = user_input["device"]
-            device_info = self._discovered_devices[selected_id]
+            selected = [
+                self._discovered_devices[key] for key in user_input["devices"]
+            ]
+            if len(selected) > 1:
+                return await self._async_add_bulk(selected)
+
+            # Single pump: no extra validation, the scan just heard from it
+            device_info = selected[0]
 
             # Check if already configured
             await self.async_set_unique_id(device_info["device_id"])
@@ -146,13 +193,7 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # Create entry
             return self.async_create_entry(
                 title=f"{device_info['model']} ({device_info['ip']})",
-                data={
-                    CONF_HOST: device_info["ip"],
-                    CONF_DEVICE_ID: device_info["device_id"],
-                    CONF_MODEL: device_info["model"],
-                    "mac_address": device_info.get("mac"),
-                    "firmware_version": device_info.get("firmware_version"),
-                },
+                data=self._entry_data(device_info),
             )
 
         # Perform discovery
@@ -183,11 +224,11 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._no_devices_reason = "no_devices"
             return await self.async_step_manual()
 
-        # Filter to MDP-20000 devices (MD-4.4 support can be added later)
-        mdp_devices = [d for d in devices if d.is_mdp20000]
+        # Filter to supported models (MDP-20000 pumps, MD-4.4 dosers)
+        mdp_devices = [d for d in devices if d.is_mdp20000 or d.is_md44]
 
         if not mdp_devices:
-            _LOGGER.warning("No MDP-20000 devices found")
+            _LOGGER.warning("No supported devices found")
             self._discovery_attempted = True
             self._no_devices_reason = "no_mdp20000"
             return await self.async_step_manual()
@@ -218,7 +259,6 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "ip": d.ip_address,
                 "model": d.model,
                 "mac": d.mac_address,
-                "firmware_version": d.firmware_version,
             }
             for d in mdp_devices
         }
@@ -236,11 +276,18 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="select_device",
             data_schema=vol.Schema(
                 {
-                    vol.Required("device"): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=device_options,
-                            mode=selector.SelectSelectorMode.DROPDOWN,
-                        )
+                    vol.Required(
+                        "devices",
+                        default=list(self._discovered_devices),  # All by default
+                    ): vol.All(
+                        selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                options=device_options,
+                                multiple=True,
+                                mode=selector.SelectSelectorMode.LIST,
+                            )
+                        ),
+                        vol.Length(min=1),
                     ),
                 }
             ),
@@ -250,30 +297,147 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    def _entry_data(self, device_info: dict[str, Any]) -> dict[str, Any]:
+        """Build config entry data for a pump found by the discovery scan."""
+        return {
+            CONF_HOST: device_info["ip"],
+            CONF_DEVICE_ID: device_info["device_id"],
+            CONF_MODEL: device_info["model"],
+            "mac_address": device_info.get("mac"),
+            CONF_INTERFACES: self._selected_interfaces,
+        }
+
+    async def _async_add_bulk(
+        self, selected: list[dict[str, Any]]
+    ) -> FlowResult:
+        """Validate several pumps concurrently, then show which ones answered.
+
+        Nothing is added until the results are confirmed, so abandoning the
+        form adds none of the pumps.
+        """
+        semaphore = asyncio.Semaphore(BULK_VALIDATE_CONCURRENCY)
+        broker = async_get_broker(self.hass)
+
+        async def _validate(device_info: dict[str, Any]) -> str | None:
+            async with semaphore:
+                try:
+                    async with broker.async_session(
+                        device_info["ip"],
+                        device_info["device_id"],
+                        model=device_info["model"],
+                    ) as device:
+                        await device.update()
+                except JebaoError as err:
+                    return str(err) or type(err).__name__
+            return None
+
+        errors = await asyncio.gather(*(_validate(info) for info in selected))
+
+        lines: list[str] = []
+        for device_info, error in zip(selected, errors):
+            label = f"{device_info['model']} ({device_info['device_id']}) at {device_info['ip']}"
+            if error is not None:
+                lines.append(f"- ❌ {label}: {error}")
+                continue
+            self._bulk_validated.append(device_info)
+            lines.append(f"- ✅ {label}")
+
+        _LOGGER.info(
+            "Bulk add: %d of %d pump(s) validated",
+            errors.count(None),
+            len(selected),
+        )
+        self._bulk_results = "\n".join(lines)
+        return await self.async_step_bulk_result()
+
+    async def async_step_bulk_result(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Show per-pump results of a bulk add; add the good ones on confirm.
+
+        This flow creates the entry for the first good pump; each of the
+        others gets a bulk add flow of its own, which only accepts pumps
+        validated here, all from the single discovery scan.
+        """
+        if user_input is not None:
+            if not self._bulk_validated:
+                return self.async_abort(reason="cannot_connect")
+            first, *others = self._bulk_validated
+
+            # Claim the first pump before adding the others, so this flow
+            # cannot end in "already configured" after adding them
+            await self.async_set_unique_id(first["device_id"])
+            self._abort_if_unique_id_configured()
+
+            validated: dict[str, dict[str, Any]] = self.hass.data.setdefault(
+                DOMAIN, {}
+            ).setdefault(DATA_BULK_ADD, {})
+            for device_info in others:
+                validated[device_info["device_id"]] = self._entry_data(device_info)
+                result = await self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": SOURCE_BULK_ADD},
+                    data={CONF_DEVICE_ID: device_info["device_id"]},
+                )
+                if result["type"] != FlowResultType.CREATE_ENTRY:
+                    _LOGGER.warning(
+                        "Bulk add: %s not added: %s",
+                        device_info["device_id"],
+                        result.get("reason"),
+                    )
+            return self.async_create_entry(
+                title=f"{first['model']} ({first['ip']})",
+                data=self._entry_data(first),
+            )
+
+        return self.async_show_form(
+            step_id="bulk_result",
+            description_placeholders={"results": self._bulk_results},
+        )
+
+    async def async_step_bulk_add(self, bulk_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a pump validated by another flow's bulk add.
+
+        Only the device ID is passed in; the entry data is taken from the
+        pumps the bulk add validated, so nothing else can create entries
+        through this step.
+        """
+        validated = self.hass.data.get(DOMAIN, {}).get(DATA_BULK_ADD, {})
+        entry_data = validated.pop(bulk_data.get(CONF_DEVICE_ID), None)
+        if entry_data is None:
+            return self.async_abort(reason="not_validated")
+
+        await self.async_set_unique_id(entry_data[CONF_DEVICE_ID])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=f"{entry_data[CONF_MODEL]} ({entry_data[CONF_HOST]})",
+            data=entry_data,
+        )
+
     async def async_step_dhcp(
         self, discovery_info: DhcpServiceInfo
     ) -> FlowResult:
         """Handle DHCP discovery - used for IP recovery on registered devices."""
-        mac_normalized = discovery_info.macaddress.lower().replace(":", "")
         ip = discovery_info.ip
 
-        for entry in self._async_current_entries():
-            stored_mac = (entry.data.get("mac_address") or "").lower().replace(":", "")
-            if stored_mac and stored_mac == mac_normalized:
-                if entry.data.get(CONF_HOST) != ip:
-                    _LOGGER.info(
-                        "DHCP recovery: updating %s IP from %s to %s",
-                        entry.title,
-                        entry.data.get(CONF_HOST),
-                        ip,
-                    )
-                    self.hass.config_entries.async_update_entry(
-                        entry, data={**entry.data, CONF_HOST: ip}
-                    )
-                    self.hass.async_create_task(
-                        self.hass.config_entries.async_reload(entry.entry_id)
-                    )
-                return self.async_abort(reason="already_configured")
+        entry = async_get_index(self.hass).async_get_entry(
+            mac=discovery_info.macaddress
+        )
+        if entry is not None:
+            if entry.data.get(CONF_HOST) != ip:
+                _LOGGER.info(
+                    "DHCP recovery: updating %s IP from %s to %s",
+                    entry.title,
+                    entry.data.get(CONF_HOST),
+                    ip,
+                )
+                self.hass.config_entries.async_update_entry(
+                    entry, data={**entry.data, CONF_HOST: ip}
+                )
+                self.hass.async_create_task(
+                    self.hass.config_entries.async_reload(entry.entry_id)
+                )
+            return self.async_abort(reason="already_configured")
 
         # Unknown MAC - we don't try to auto-create entries from DHCP alone
         # (need pump-side validation; UDP discovery covers new pumps).
@@ -310,7 +474,7 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_DEVICE_ID: device_id,
                     CONF_MODEL: info["model"],
                     "mac_address": info.get("mac_address"),
-                    "firmware_version": info.get("firmware_version"),
+                    CONF_INTERFACES: info.get(CONF_INTERFACES),
                 },
             )
 
@@ -332,9 +496,14 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             host = user_input[CONF_HOST]
 
+            if async_get_index(self.hass).async_get_entry(host=host) is not None:
+                return self.async_abort(reason="already_configured")
+
             try:
-                # Validate connection
-                info = await validate_connection(self.hass, host)
+                # Identify the pump (fast UDP probe, TCP as fallback)
+                info = await identify_device(self.hass, host)
+                if info["model"] not in SUPPORTED_MODELS:
+                    raise UnsupportedModel(info["model"])
 
                 # Check if already configured
                 await self.async_set_unique_id(info["device_id"])
@@ -348,10 +517,12 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_DEVICE_ID: info["device_id"],
                         CONF_MODEL: info["model"],
                         "mac_address": info.get("mac_address"),
-                        "firmware_version": info.get("firmware_version"),
                     },
                 )
 
+            except UnsupportedModel as err:
+                _LOGGER.error("Pump at %s is an unsupported model: %s", host, err)
+                errors["base"] = "unsupported_model"
             except JebaoError as err:
                 _LOGGER.error("Failed to connect to %s: %s", host, err)
                 errors["base"] = "cannot_connect"
@@ -368,8 +539,8 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
             elif self._no_devices_reason == "no_mdp20000":
                 description_placeholders["discovery_result"] = (
-                    "⚠️ No MDP-20000 pumps were found during automatic discovery. "
-                    "Other Jebao models may not be supported yet."
+                    "⚠️ No MDP-20000 pumps or MD-4.4 dosers were found during "
+                    "automatic discovery. Other Jebao models are not supported yet."
                 )
             else:
                 description_placeholders["discovery_result"] = (
@@ -394,9 +565,13 @@ class JebaoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def _get_available_interfaces() -> list[str]:
         """Get available network interfaces.
 
+        Runs in the executor; netifaces is only imported once a flow needs it.
+
         Returns:
             List of interface names that have IPv4 addresses
         """
+        import netifaces  # pylint: disable=import-outside-toplevel
+
         interfaces = []
 
         try:
@@ -440,7 +615,25 @@ class JebaoOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        from .const import DEFAULT_SCAN_INTERVAL
+        from .const import (
+            CONF_COMMAND_BURST,
+            CONF_COMMAND_RATE,
+            CONF_FAILURE_THRESHOLD,
+            CONF_KEEP_PROGRAM_MODE,
+            CONF_POLL_BURST,
+            CONF_POLL_RATE,
+            CONF_RECONCILE,
+            CONF_STALE_TIMEOUT,
+            DEFAULT_COMMAND_BURST,
+            DEFAULT_COMMAND_RATE,
+            DEFAULT_FAILURE_THRESHOLD,
+            DEFAULT_KEEP_PROGRAM_MODE,
+            DEFAULT_POLL_BURST,
+            DEFAULT_POLL_RATE,
+            DEFAULT_RECONCILE,
+            DEFAULT_SCAN_INTERVAL,
+            DEFAULT_STALE_TIMEOUT,
+        )
 
         return self.async_show_form(
             step_id="init",
@@ -452,6 +645,54 @@ class JebaoOptionsFlow(config_entries.OptionsFlow):
                             "scan_interval", DEFAULT_SCAN_INTERVAL
                         ),
                     ): vol.All(vol.Coerce(int), vol.Range(min=10, max=300)),
+                    vol.Optional(
+                        CONF_KEEP_PROGRAM_MODE,
+                        default=self.config_entry.options.get(
+                            CONF_KEEP_PROGRAM_MODE, DEFAULT_KEEP_PROGRAM_MODE
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_RECONCILE,
+                        default=self.config_entry.options.get(
+                            CONF_RECONCILE, DEFAULT_RECONCILE
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_POLL_RATE,
+                        default=self.config_entry.options.get(
+                            CONF_POLL_RATE, DEFAULT_POLL_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+                    vol.Optional(
+                        CONF_POLL_BURST,
+                        default=self.config_entry.options.get(
+                            CONF_POLL_BURST, DEFAULT_POLL_BURST
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                    vol.Optional(
+                        CONF_COMMAND_RATE,
+                        default=self.config_entry.options.get(
+                            CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+                    vol.Optional(
+                        CONF_COMMAND_BURST,
+                        default=self.config_entry.options.get(
+                            CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                    vol.Optional(
+                        CONF_FAILURE_THRESHOLD,
+                        default=self.config_entry.options.get(
+                            CONF_FAILURE_THRESHOLD, DEFAULT_FAILURE_THRESHOLD
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                    vol.Optional(
+                        CONF_STALE_TIMEOUT,
+                        default=self.config_entry.options.get(
+                            CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
                 }
             ),
         )
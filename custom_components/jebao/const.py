@@ -1,17 +1,107 @@
 """Constants for the Jebao integration."""
+from datetime import timedelta
 from typing import Final
 
 DOMAIN: Final = "jebao"
 
+# Domain-wide hass.data keys (per-entry data is keyed by entry_id)
+DATA_BROKER: Final = "broker"
+DATA_INDEX: Final = "index"
+DATA_DISCOVERY: Final = "discovery"
+DATA_TELEMETRY: Final = "telemetry"
+DATA_BURST: Final = "burst"
+DATA_TRACE: Final = "trace"
+DATA_PROFILE: Final = "profile"
+DATA_SNAPSHOTS: Final = "snapshots"
+DATA_BULK_ADD: Final = "bulk_add"
+
 # Configuration
 CONF_DEVICE_ID: Final = "device_id"
 CONF_MODEL: Final = "model"
 CONF_INTERFACES: Final = "interfaces"
+CONF_KEEP_PROGRAM_MODE: Final = "keep_program_mode"
+CONF_RECONCILE: Final = "reconcile"
+CONF_POLL_RATE: Final = "poll_rate"
+CONF_POLL_BURST: Final = "poll_burst"
+CONF_COMMAND_RATE: Final = "command_rate"
+CONF_COMMAND_BURST: Final = "command_burst"
+CONF_FAILURE_THRESHOLD: Final = "failure_threshold"
+CONF_STALE_TIMEOUT: Final = "stale_timeout"
 
 # Defaults
 DEFAULT_NAME: Final = "Jebao Pump"
 DEFAULT_SCAN_INTERVAL: Final = 30  # seconds
+DEFAULT_KEEP_PROGRAM_MODE: Final = False
+DEFAULT_RECONCILE: Final = True
+DEFAULT_FEED_DURATION: Final = 1  # minutes
+DEFAULT_PROFILE_DURATION: Final = 60  # seconds
+DEFAULT_BLOCK_THRESHOLD: Final = 50  # milliseconds
+# Per-pump request budgets (requests per second, requests back to back).
+# Status reads are budgeted so 0.5 s bursts still run unthrottled.
+DEFAULT_POLL_RATE: Final = 2.0
+DEFAULT_POLL_BURST: Final = 4
+DEFAULT_COMMAND_RATE: Final = 2.0
+DEFAULT_COMMAND_BURST: Final = 4
+# Failed polls held with the last values before entities turn unavailable:
+# polls in a row, and seconds since the last good read
+DEFAULT_FAILURE_THRESHOLD: Final = 3
+DEFAULT_STALE_TIMEOUT: Final = 300
+
+# Runtime counters and statistics credit each poll's state up to the next
+# poll, but not across longer gaps (e.g. polling disabled). Time while the
+# pump is unreachable, or stale, is neither on nor off and is left out.
+MAX_SAMPLE_GAP: Final = timedelta(minutes=10)
 
 # Models
 MODEL_MDP20000: Final = "MDP-20000"
 MODEL_MD44: Final = "MD-4.4"
+
+# MDP-20000 speed range is 30-100
+SPEED_RANGE: Final = (30, 100)
+
+# Services
+SERVICE_SET_GROUP: Final = "set_group"
+SERVICE_FEED_ALL: Final = "feed_all"
+SERVICE_CANCEL_FEED_ALL: Final = "cancel_feed_all"
+SERVICE_BURST_POLL: Final = "burst_poll"
+SERVICE_TRACE: Final = "trace"
+SERVICE_PROFILE: Final = "profile"
+SERVICE_SNAPSHOT: Final = "snapshot"
+SERVICE_RESTORE: Final = "restore"
+
+ATTR_PERCENTAGE: Final = "percentage"
+ATTR_MODE: Final = "mode"
+ATTR_ANTIPHASE_PERCENTAGE: Final = "antiphase_percentage"
+ATTR_DURATION: Final = "duration"
+ATTR_RETRIES: Final = "retries"
+ATTR_INTERVAL: Final = "interval"
+ATTR_ENABLED: Final = "enabled"
+ATTR_SIZE: Final = "size"
+ATTR_BLOCK_THRESHOLD: Final = "block_threshold"
+ATTR_DETAILED: Final = "detailed"
+ATTR_NAME: Final = "name"
+
+# Group modes for set_group
+GROUP_MODE_SYNC: Final = "sync"
+GROUP_MODE_ALTERNATE: Final = "alternate"
+GROUP_MODE_ANTIPHASE: Final = "antiphase"
+GROUP_MODES: Final = [GROUP_MODE_SYNC, GROUP_MODE_ALTERNATE, GROUP_MODE_ANTIPHASE]
+
+# Device triggers (fired as EVENT_JEBAO by the coordinator)
+EVENT_JEBAO: Final = "jebao_event"
+TRIGGER_TURNED_ON: Final = "turned_on"
+TRIGGER_TURNED_OFF: Final = "turned_off"
+TRIGGER_FEED_STARTED: Final = "feed_started"
+TRIGGER_FEED_ENDED: Final = "feed_ended"
+TRIGGER_ENTERED_PROGRAM_MODE: Final = "entered_program_mode"
+TRIGGER_LEFT_PROGRAM_MODE: Final = "left_program_mode"
+TRIGGER_UNREACHABLE: Final = "unreachable"
+TRIGGER_TYPES: Final = (
+    TRIGGER_TURNED_ON,
+    TRIGGER_TURNED_OFF,
+    TRIGGER_FEED_STARTED,
+    TRIGGER_FEED_ENDED,
+    TRIGGER_ENTERED_PROGRAM_MODE,
+    TRIGGER_LEFT_PROGRAM_MODE,
+    TRIGGER_UNREACHABLE,
+)
@@ -1,19 +1,58 @@
 """Data update coordinator for Jebao."""
-from datetime import timedelta
+import asyncio
+from datetime import datetime, timedelta
+import functools
 import logging
-from typing import Optional
+import time
+from typing import Any, Optional
 
-from jebao import JebaoError, MDP20000Device, discover_devices
+from jebao import JebaoError, MDP20000Device
+from jebao.exceptions import JebaoInvalidStateError
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_DEVICE_ID, CONF_HOST, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util.percentage import percentage_to_ranged_value
 
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .availability import JebaoAvailability
+from .broker import async_get_broker
+from .const import (
+    CONF_KEEP_PROGRAM_MODE,
+    CONF_RECONCILE,
+    DEFAULT_KEEP_PROGRAM_MODE,
+    DEFAULT_RECONCILE,
+    DEFAULT_FEED_DURATION,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_JEBAO,
+    SPEED_RANGE,
+    TRIGGER_ENTERED_PROGRAM_MODE,
+    TRIGGER_FEED_ENDED,
+    TRIGGER_FEED_STARTED,
+    TRIGGER_LEFT_PROGRAM_MODE,
+    TRIGGER_TURNED_OFF,
+    TRIGGER_TURNED_ON,
+    TRIGGER_UNREACHABLE,
+)
+from .discovery import async_get_discovery_scheduler
+from .index import async_get_index
+from .latency import JebaoRequestPolicy
+from .md44 import MD44Device
 
 _LOGGER = logging.getLogger(__name__)
 
+# Minimum time between automatic drift corrections for one pump (seconds)
+RECONCILE_MIN_INTERVAL = 60.0
+
+# Slack after the expected feed end before the targeted refresh (seconds)
+FEED_END_SLACK = 2.0
+# Follow-up checks if the pump is still feeding after the expected end
+FEED_END_RECHECKS = 3
+
 
 class JebaoDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Jebao data."""
@@ -32,6 +71,47 @@ class JebaoDataUpdateCoordinator(DataUpdateCoordinator):
         self.device_id = device_id
         self._discovery_attempted = False
 
+        # Deadlines from observed round trips, budgeted retries
+        self.requests = JebaoRequestPolicy(
+            functools.partial(async_get_broker(hass).async_connect, device, timeout=5.0)
+        )
+        # Failed polls held with the last values before entities go unavailable
+        self.availability = JebaoAvailability.from_entry(entry)
+        self._feed_start: Optional[asyncio.Task[None]] = None
+
+        # Desired state (is_on, speed, manual_mode) that polls reconcile against
+        keep_program_mode = entry.options.get(
+            CONF_KEEP_PROGRAM_MODE, DEFAULT_KEEP_PROGRAM_MODE
+        )
+        self.desired: dict[str, Any] = {}
+        self._manual_mode = not keep_program_mode
+        self._reconcile = (
+            entry.options.get(CONF_RECONCILE, DEFAULT_RECONCILE)
+            and not keep_program_mode
+        )
+        self._desired_pending = False
+        self._last_correction = 0.0
+        self.drift_corrections = 0
+
+        # Feed timing, so the end of feed mode is known without fast polling.
+        # feed_duration is restored by the feed duration number entity.
+        self.feed_duration = DEFAULT_FEED_DURATION
+        self.feed_started_at: Optional[datetime] = None
+        self._feed_minutes = DEFAULT_FEED_DURATION
+        self._feed_rechecks = 0
+        self._unsub_feed_timer: Optional[CALLBACK_TYPE] = None
+
+        # Faster polling requested by live consumers (e.g. telemetry
+        # subscribers); the shortest requested interval wins.
+        self._base_interval = timedelta(seconds=scan_interval)
+        self._poll_overrides: dict[str, timedelta] = {}
+        self.last_poll_duration: Optional[float] = None
+
+        # Last snapshot seen by the transition detector (kept across outages)
+        self._transition_data: Optional[dict[str, Any]] = None
+        self._transition_available = True
+        self._registry_device_id: Optional[str] = None
+
         super().__init__(
             hass,
             _LOGGER,
@@ -40,13 +120,29 @@ class JebaoDataUpdateCoordinator(DataUpdateCoordinator):
         )
 
     async def _async_update_data(self) -> dict:
-        """Fetch data from device."""
+        """Fetch data from device, keeping the last values through short outages."""
+        try:
+            data = await self._async_poll()
+        except UpdateFailed as err:
+            if self.data is not None and self.availability.hold(err):
+                return self.data
+            raise
+        self.availability.good()
+        return data
+
+    async def _async_poll(self) -> dict:
+        """Read the pump and reconcile it with the desired state."""
         try:
             # Check if connection is alive, reconnect if needed
             if not self.device.is_connected:
                 _LOGGER.warning("Connection lost, attempting to reconnect...")
+                scheduler = async_get_discovery_scheduler(self.hass)
+                if scheduler is not None:
+                    scheduler.async_request_scan()
                 try:
-                    await self.device.connect(timeout=5.0)
+                    await async_get_broker(self.hass).async_connect(
+                        self.device, timeout=5.0
+                    )
                     _LOGGER.info("Reconnected successfully")
                     self._discovery_attempted = False  # Reset flag on successful reconnect
                 except JebaoError as err:
@@ -60,19 +156,419 @@ class JebaoDataUpdateCoordinator(DataUpdateCoordinator):
                     else:
                         raise UpdateFailed(f"Failed to reconnect: {err}") from err
 
-            await self.device.update()
+            start = time.monotonic()
+            await self.requests.async_send(self.device.update, sample=True)
+            self.last_poll_duration = time.monotonic() - start
+            await self.availability.async_confirm(
+                functools.partial(self.requests.async_send, self.device.update)
+            )
+            data = self._snapshot()
 
-            return {
-                "state": self.device.state,
-                "speed": self.device.speed,
-                "is_on": self.device.is_on,
-                "is_feed_mode": self.device.is_feed_mode,
-                "is_program_mode": self.device.is_program_mode,
-            }
+            if "is_on" not in self.desired:
+                # Adopt whatever the pump is doing on first contact, keeping
+                # anything requested before it (e.g. leaving Program mode)
+                self.desired = {
+                    "is_on": data["is_on"],
+                    "speed": data["speed"],
+                    "manual_mode": self._manual_mode,
+                    **self.desired,
+                }
+            if self._should_correct(data):
+                data = await self._async_correct_drift(data)
+
+            self._track_feed(data)
+            return data
 
         except JebaoError as err:
             raise UpdateFailed(f"Error communicating with device: {err}") from err
 
+    def _snapshot(self) -> dict[str, Any]:
+        """Build coordinator data from the device's last read state."""
+        return {
+            "state": self.device.state,
+            "speed": self.device.speed,
+            "is_on": self.device.is_on,
+            "is_feed_mode": self.device.is_feed_mode,
+            "is_program_mode": self.device.is_program_mode,
+        }
+
+    def _drift(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return the desired values the pump currently deviates from."""
+        if data["is_feed_mode"]:
+            return {}  # Feed mode is a deliberate, self-ending pause
+
+        if data["is_program_mode"]:
+            if self.desired.get("manual_mode"):
+                return {"manual_mode": True}
+            return {}  # Pump is running its own schedule
+
+        drift: dict[str, Any] = {}
+        is_on = self.desired.get("is_on")
+        if is_on is not None and is_on != data["is_on"]:
+            drift["is_on"] = is_on
+        speed = self.desired.get("speed")
+        if speed is not None and self.desired.get("is_on", True) and speed != data["speed"]:
+            drift["speed"] = speed
+        return drift
+
+    def _should_correct(self, data: dict[str, Any]) -> bool:
+        """Decide whether this poll should send corrective commands.
+
+        Commands queued while offline (or not yet confirmed by a poll) are
+        applied right away; other drift is corrected at most once per
+        RECONCILE_MIN_INTERVAL so a pump that refuses a value isn't hammered.
+        """
+        if not self._drift(data):
+            self._desired_pending = False
+            return False
+        if self._desired_pending:
+            return True
+        return (
+            self._reconcile
+            and time.monotonic() - self._last_correction >= RECONCILE_MIN_INTERVAL
+        )
+
+    async def _async_correct_drift(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Send corrective commands and return the re-read state."""
+        _LOGGER.warning(
+            "%s drifted from desired state, correcting: %s",
+            self.entry.title,
+            self._drift(data),
+        )
+        self._desired_pending = False
+        self._last_correction = time.monotonic()
+        self.drift_corrections += 1
+
+        try:
+            await self._async_apply_desired()
+            await self.requests.async_send(self.device.update, sample=True)
+        except JebaoError as err:
+            _LOGGER.error("Failed to correct %s: %s", self.entry.title, err)
+            return data
+
+        return self._snapshot()
+
+    async def async_set_desired(
+        self,
+        *,
+        is_on: Optional[bool] = None,
+        speed: Optional[int] = None,
+        manual_mode: Optional[bool] = None,
+    ) -> bool:
+        """Record a desired pump state and send the commands to reach it.
+
+        If the pump is offline the request is folded into the desired state
+        and applied by the first poll after reconnecting. Does not refresh;
+        callers batch refreshes themselves.
+
+        Args:
+            is_on: Desired power state, None to leave unchanged
+            speed: Desired device speed (30-100), None to leave unchanged
+            manual_mode: Whether to leave Program mode, None to leave unchanged
+
+        Returns:
+            True if any command was sent
+
+        Raises:
+            JebaoError: Command failed (the desired state is kept and retried)
+        """
+        if is_on is not None:
+            self.desired["is_on"] = is_on
+        if speed is not None:
+            self.desired["speed"] = speed
+        if manual_mode is not None:
+            self.desired["manual_mode"] = manual_mode
+        self._desired_pending = True
+
+        if not self.device.is_connected:
+            _LOGGER.info(
+                "%s is offline, will apply %s on reconnect",
+                self.entry.title,
+                self.desired,
+            )
+            return False
+
+        return await self._async_apply_desired()
+
+    async def _async_apply_desired(self) -> bool:
+        """Send the commands that move the device to the desired state.
+
+        Compares against the device's last read state and skips commands that
+        would not change anything.
+        """
+        device = self.device
+        send = self.requests.async_send
+        sent = False
+
+        if self.desired.get("manual_mode") and device.is_program_mode:
+            await send(device.ensure_manual_mode)
+            sent = True
+
+        is_on = self.desired.get("is_on")
+        if is_on is not None and is_on != device.is_on:
+            await send(device.turn_on if is_on else device.turn_off)
+            sent = True
+
+        speed = self.desired.get("speed")
+        if speed is not None and self.desired.get("is_on", True) and speed != device.speed:
+            await send(device.set_speed, speed)
+            sent = True
+
+        return sent
+
+    @property
+    def fresh_data(self) -> Optional[dict[str, Any]]:
+        """Return the latest snapshot if this poll read it from the pump.
+
+        None while the pump is unreachable or its last values are only held
+        over a failed poll (stale).
+        """
+        if not self.last_update_success or self.availability.stale:
+            return None
+        return self.data
+
+    @property
+    def feed_ends_at(self) -> Optional[datetime]:
+        """Return when the current feed mode is expected to end."""
+        if self.feed_started_at is None:
+            return None
+        return self.feed_started_at + timedelta(minutes=self._feed_minutes)
+
+    async def async_set_feed_duration(self, minutes: int) -> None:
+        """Configure the pump's feed timer and remember the duration.
+
+        Raises:
+            JebaoError: Command failed
+        """
+        await self.requests.async_send(self.device.set_feed_duration, minutes)
+        self.feed_duration = minutes
+
+    async def async_start_feed(self, minutes: Optional[int] = None) -> None:
+        """Start feed mode and schedule a refresh for when it should end.
+
+        Starting feed is not idempotent, so it is sent once and never
+        retried. Calls made while a start is in flight share its result,
+        and calls made while a feed is already running do nothing.
+
+        Args:
+            minutes: Feed duration, defaults to the configured duration
+
+        Raises:
+            JebaoError: Command failed
+        """
+        if minutes is None:
+            minutes = self.feed_duration
+
+        if self._feed_start is not None:
+            self.requests.stats.deduplicated += 1
+        elif self._feeding():
+            _LOGGER.debug("%s is already feeding, not starting again", self.entry.title)
+            self.requests.stats.deduplicated += 1
+            return
+        else:
+            self._feed_start = self.hass.async_create_task(
+                self._async_send_start_feed(minutes), eager_start=False
+            )
+            self._feed_start.add_done_callback(self._async_feed_start_done)
+
+        await asyncio.shield(self._feed_start)
+
+    def _feeding(self) -> bool:
+        """Return True if a feed is running and not yet due to end."""
+        ends_at = self.feed_ends_at
+        return (
+            self.device.is_feed_mode
+            and ends_at is not None
+            and dt_util.utcnow() < ends_at
+        )
+
+    async def _async_send_start_feed(self, minutes: int) -> None:
+        """Send the feed start command once."""
+        try:
+            await self.requests.async_send(
+                self.device.start_feed, minutes=minutes, idempotent=False
+            )
+        except JebaoInvalidStateError:
+            if not self.device.is_feed_mode:
+                raise
+            # A feed started meanwhile (pump button, app) is already running
+        self._async_feed_started(minutes)
+
+    @callback
+    def _async_feed_start_done(self, task: asyncio.Task[None]) -> None:
+        """Forget a finished feed start."""
+        if self._feed_start is task:
+            self._feed_start = None
+
+    async def async_cancel_feed(self) -> None:
+        """Cancel feed mode.
+
+        Raises:
+            JebaoError: Command failed
+        """
+        try:
+            await self.requests.async_send(self.device.cancel_feed)
+        except JebaoInvalidStateError:
+            if self.device.is_feed_mode:
+                raise
+            # Already over (ended on time, or a retried cancel got through)
+        self._async_feed_ended()
+
+    def _track_feed(self, data: dict[str, Any]) -> None:
+        """Follow feed mode transitions seen by a poll."""
+        if not data["is_feed_mode"]:
+            self._async_feed_ended()
+            return
+
+        if self.feed_started_at is None:
+            # Started outside Home Assistant (pump button, app); best guess
+            # is that it started now with the configured duration.
+            self._async_feed_started(self.feed_duration)
+        elif self._unsub_feed_timer is None and self._feed_rechecks < FEED_END_RECHECKS:
+            # Past the expected end and still feeding; look again shortly
+            self._feed_rechecks += 1
+            self._schedule_feed_timer(FEED_END_SLACK * 2)
+
+    @callback
+    def _async_feed_started(self, minutes: int) -> None:
+        """Record the start of feed mode and schedule the end-of-feed refresh."""
+        self.feed_started_at = dt_util.utcnow()
+        self._feed_minutes = minutes
+        self._feed_rechecks = 0
+        self._schedule_feed_timer(minutes * 60 + FEED_END_SLACK)
+
+    @callback
+    def _async_feed_ended(self) -> None:
+        """Forget feed timing once feed mode is over."""
+        self.feed_started_at = None
+        self._cancel_feed_timer()
+
+    @callback
+    def _schedule_feed_timer(self, delay: float) -> None:
+        """Schedule a single targeted refresh after the given delay."""
+        self._cancel_feed_timer()
+        self._unsub_feed_timer = async_call_later(
+            self.hass, delay, HassJob(self._async_feed_timer_fired, cancel_on_shutdown=True)
+        )
+
+    @callback
+    def _cancel_feed_timer(self) -> None:
+        """Cancel a pending end-of-feed refresh."""
+        if self._unsub_feed_timer is not None:
+            self._unsub_feed_timer()
+            self._unsub_feed_timer = None
+
+    @callback
+    def _async_feed_timer_fired(self, _now: datetime) -> None:
+        """Refresh right when feed mode should have ended."""
+        self._unsub_feed_timer = None
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Fire transition events, then update listeners."""
+        self._async_fire_transitions()
+        super().async_update_listeners()
+
+    @callback
+    def _async_fire_transitions(self) -> None:
+        """Fire an event for each edge between this and the previous snapshot.
+
+        Computed once per update so device triggers can match on the event
+        type alone instead of evaluating state templates on every update.
+        """
+        available = self.last_update_success
+        was_available = self._transition_available
+        self._transition_available = available
+
+        transitions: list[str] = []
+        if was_available and not available:
+            transitions.append(TRIGGER_UNREACHABLE)
+
+        previous = self._transition_data
+        data = self.data if available else None
+        if data:
+            self._transition_data = data
+        if data and previous:
+            for key, rising, falling in (
+                ("is_on", TRIGGER_TURNED_ON, TRIGGER_TURNED_OFF),
+                ("is_feed_mode", TRIGGER_FEED_STARTED, TRIGGER_FEED_ENDED),
+                (
+                    "is_program_mode",
+                    TRIGGER_ENTERED_PROGRAM_MODE,
+                    TRIGGER_LEFT_PROGRAM_MODE,
+                ),
+            ):
+                if bool(data[key]) != bool(previous[key]):
+                    transitions.append(rising if data[key] else falling)
+
+        if not transitions:
+            return
+
+        if self._registry_device_id is None:
+            device = dr.async_get(self.hass).async_get_device(
+                identifiers={(DOMAIN, self.device_id)}
+            )
+            if device is None:
+                return
+            self._registry_device_id = device.id
+
+        for transition in transitions:
+            _LOGGER.debug("%s: %s", self.entry.title, transition)
+            self.hass.bus.async_fire(
+                EVENT_JEBAO,
+                {
+                    CONF_DEVICE_ID: self._registry_device_id,
+                    CONF_TYPE: transition,
+                },
+            )
+
+    @callback
+    def async_set_poll_override(
+        self, key: str, interval: Optional[timedelta]
+    ) -> None:
+        """Request a faster poll interval under a key, or release it with None."""
+        if interval is None:
+            self._poll_overrides.pop(key, None)
+        else:
+            self._poll_overrides[key] = interval
+
+        new_interval = min([self._base_interval, *self._poll_overrides.values()])
+        if new_interval == self.update_interval:
+            return
+        sooner = new_interval < self.update_interval
+        self.update_interval = new_interval
+        _LOGGER.debug(
+            "Poll interval for %s now %ss", self.entry.title, new_interval.total_seconds()
+        )
+        if sooner and self._listeners:
+            # Don't wait out the old, longer interval
+            self._schedule_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending timers along with the scheduled refresh."""
+        self._cancel_feed_timer()
+        await super().async_shutdown()
+
+    async def async_send_percentage(self, percentage: int) -> bool:
+        """Set the desired state for a speed percentage and apply it.
+
+        Args:
+            percentage: Target speed as a 0-100 percentage (0 turns the pump off)
+
+        Returns:
+            True if any command was sent, False if the pump was already there
+
+        Raises:
+            JebaoError: Command failed
+        """
+        if percentage == 0:
+            return await self.async_set_desired(is_on=False)
+
+        # Convert percentage (0-100) to device speed (30-100)
+        speed = round(percentage_to_ranged_value(SPEED_RANGE, percentage))
+        return await self.async_set_desired(is_on=True, speed=speed)
+
     async def _try_discovery_recovery(self) -> Optional[str]:
         """Try to find device via discovery if IP changed.
 
@@ -84,30 +580,36 @@ class JebaoDataUpdateCoordinator(DataUpdateCoordinator):
             return None
 
         self._discovery_attempted = True
-        current_ip = self.entry.data[CONF_HOST]
+        # The scan may already have moved the entry; the session still has the old IP
+        current_ip = self.device.host
 
         _LOGGER.info("Attempting discovery to find device %s (current IP: %s)", self.device_id, current_ip)
 
         try:
-            devices = await discover_devices(timeout=10.0)
-
-            # Find our device by device_id
-            for device in devices:
-                if device.device_id == self.device_id:
-                    if device.ip_address != current_ip:
-                        _LOGGER.warning(
-                            "Device %s found at new IP: %s (was: %s)",
-                            self.device_id,
-                            device.ip_address,
-                            current_ip
-                        )
-                        return device.ip_address
-                    else:
-                        _LOGGER.info("Device found at same IP %s", current_ip)
-                        return current_ip
+            # Run (or join) the shared background scan rather than a private
+            # one, and read this pump's reply from the index
+            start = time.monotonic()
+            scheduler = async_get_discovery_scheduler(self.hass)
+            if scheduler is not None:
+                await scheduler.async_scan()
+            device = async_get_index(self.hass).async_get_discovered(
+                self.device_id, max_age=time.monotonic() - start
+            )
+            if device is None:
+                _LOGGER.error("Device %s not found in discovery", self.device_id)
+                return None
 
-            _LOGGER.error("Device %s not found in discovery", self.device_id)
-            return None
+            if device.ip_address != current_ip:
+                _LOGGER.warning(
+                    "Device %s found at new IP: %s (was: %s)",
+                    self.device_id,
+                    device.ip_address,
+                    current_ip
+                )
+                return device.ip_address
+
+            _LOGGER.info("Device found at same IP %s", current_ip)
+            return current_ip
 
         except Exception as err:
             _LOGGER.error("Discovery failed: %s", err)
@@ -122,19 +624,102 @@ class JebaoDataUpdateCoordinator(DataUpdateCoordinator):
         Raises:
             JebaoError: If reconnection fails
         """
-        current_ip = self.entry.data[CONF_HOST]
+        current_ip = self.device.host
 
-        # Update config entry with new IP
-        _LOGGER.info("Updating config entry IP from %s to %s", current_ip, new_ip)
-        new_data = dict(self.entry.data)
-        new_data[CONF_HOST] = new_ip
-        self.hass.config_entries.async_update_entry(self.entry, data=new_data)
+        # Update config entry with new IP (unless the discovery scan already did)
+        if self.entry.data[CONF_HOST] != new_ip:
+            _LOGGER.info("Updating config entry IP from %s to %s", current_ip, new_ip)
+            self.hass.config_entries.async_update_entry(
+                self.entry, data={**self.entry.data, CONF_HOST: new_ip}
+            )
 
         # Update device instance with new IP
+        broker = async_get_broker(self.hass)
         self.device.host = new_ip
+        broker.async_rehost(self.device, current_ip)
 
         # Reconnect
-        await self.device.disconnect()
-        await self.device.connect(timeout=5.0)
+        await broker.async_disconnect(self.device)
+        await broker.async_connect(self.device, timeout=5.0)
         _LOGGER.info("Successfully reconnected to device at new IP %s", new_ip)
         self._discovery_attempted = False  # Reset flag on successful reconnect
+
+
+class JebaoMD44Coordinator(DataUpdateCoordinator):
+    """Poll an MD-4.4 doser's raw status frame (one exchange per poll).
+
+    The frame is not decoded (see md44.py); polling keeps the doser's
+    availability, request and diagnostics data current.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device: MD44Device,
+        entry: ConfigEntry,
+        device_id: str,
+        scan_interval: int = DEFAULT_SCAN_INTERVAL,
+    ) -> None:
+        """Initialize coordinator."""
+        self.device = device
+        self.entry = entry
+        self.device_id = device_id
+        self.requests = JebaoRequestPolicy(
+            functools.partial(async_get_broker(hass).async_connect, device, timeout=5.0)
+        )
+        self.availability = JebaoAvailability.from_entry(entry)
+        self.last_poll_duration: Optional[float] = None
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=scan_interval),
+        )
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch the status frame, keeping the last one through short outages."""
+        try:
+            data = await self._async_poll()
+        except UpdateFailed as err:
+            if self.data is not None and self.availability.hold(err):
+                return self.data
+            raise
+        self.availability.good()
+        return data
+
+    async def _async_poll(self) -> dict[str, Any]:
+        """Fetch the raw status frame from the doser."""
+        try:
+            if not self.device.is_connected:
+                _LOGGER.warning("Connection to %s lost, reconnecting", self.entry.title)
+                scheduler = async_get_discovery_scheduler(self.hass)
+                if scheduler is not None:
+                    # The scan writes a changed IP back to the entry
+                    scheduler.async_request_scan()
+                self._async_follow_entry_host()
+                await async_get_broker(self.hass).async_connect(
+                    self.device, timeout=5.0
+                )
+
+            start = time.monotonic()
+            await self.requests.async_send(self.device.update, sample=True)
+            self.last_poll_duration = time.monotonic() - start
+            await self.availability.async_confirm(
+                functools.partial(self.requests.async_send, self.device.update)
+            )
+
+        except JebaoError as err:
+            raise UpdateFailed(f"Error communicating with device: {err}") from err
+
+        return {"raw_status": self.device.raw_status}
+
+    @callback
+    def _async_follow_entry_host(self) -> None:
+        """Reconnect to the entry's IP if discovery moved it."""
+        host = self.entry.data[CONF_HOST]
+        if host != self.device.host:
+            _LOGGER.info("%s moved from %s to %s", self.entry.title, self.device.host, host)
+            old_host = self.device.host
+            self.device.set_host(host)
+            async_get_broker(self.hass).async_rehost(self.device, old_host)
@@ -0,0 +1,135 @@
+"""Persistent runtime counters for Jebao pumps.
+
+Cumulative on-time, time per speed band, on/off cycles and feeds started,
+updated in constant time from each coordinator snapshot and saved with a
+debounced write, so maintenance-by-runtime does not need history queries.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, MAX_SAMPLE_GAP
+from .coordinator import JebaoDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds to batch counter changes before writing them to disk
+SAVE_DELAY = 60
+
+# Speed bands (lowest speed of each band, highest band first)
+SPEED_BANDS: tuple[tuple[str, int], ...] = (
+    ("high", 80),
+    ("medium", 55),
+    ("low", 0),
+)
+
+COUNTER_ON_SECONDS = "on_seconds"
+COUNTER_CYCLES = "cycles"
+COUNTER_FEEDS = "feeds"
+
+
+def speed_band(speed: int) -> str:
+    """Return the speed band a device speed falls in."""
+    for band, lowest in SPEED_BANDS:
+        if speed >= lowest:
+            return band
+    return SPEED_BANDS[-1][0]
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the counter store for a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.counters.{entry_id}")
+
+
+async def async_remove_counters(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored counters of a removed config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+class JebaoRuntimeCounters:
+    """Incrementally maintained, persisted runtime counters for one pump."""
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: JebaoDataUpdateCoordinator
+    ) -> None:
+        """Initialize counters."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._store = _store(hass, coordinator.entry.entry_id)
+        self.counters: dict[str, float] = {
+            COUNTER_ON_SECONDS: 0.0,
+            COUNTER_CYCLES: 0,
+            COUNTER_FEEDS: 0,
+        }
+        self.band_seconds: dict[str, float] = {band: 0.0 for band, _ in SPEED_BANDS}
+        self._last_sample: Optional[datetime] = None
+        self._last_data: Optional[dict[str, Any]] = None
+
+    async def async_load(self) -> None:
+        """Restore counters saved by a previous run."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.counters.update(stored.get("counters", {}))
+        self.band_seconds.update(stored.get("band_seconds", {}))
+
+    async def async_save(self) -> None:
+        """Write the counters now (on unload)."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"counters": self.counters, "band_seconds": self.band_seconds}
+
+    @property
+    def on_hours(self) -> float:
+        """Return cumulative hours the pump has been running."""
+        return self.counters[COUNTER_ON_SECONDS] / 3600
+
+    def band_hours(self, band: str) -> float:
+        """Return cumulative hours running in a speed band."""
+        return self.band_seconds[band] / 3600
+
+    @callback
+    def async_update(self) -> None:
+        """Fold the latest snapshot into the counters (coordinator listener)."""
+        now = dt_util.utcnow()
+        data = self.coordinator.fresh_data
+        last, previous = self._last_sample, self._last_data
+        changed = False
+
+        # Credit the time since the last sample to the state seen then
+        if last is not None and previous is not None and now - last <= MAX_SAMPLE_GAP:
+            if previous["is_on"] and previous.get("speed") is not None:
+                seconds = (now - last).total_seconds()
+                self.counters[COUNTER_ON_SECONDS] += seconds
+                self.band_seconds[speed_band(previous["speed"])] += seconds
+                changed = True
+
+        if data:
+            if previous is not None and data["is_on"] and not previous["is_on"]:
+                self.counters[COUNTER_CYCLES] += 1
+                changed = True
+            if (
+                previous is not None
+                and data.get("is_feed_mode")
+                and not previous.get("is_feed_mode")
+            ):
+                self.counters[COUNTER_FEEDS] += 1
+                changed = True
+            self._last_sample = now
+            self._last_data = data
+        else:
+            self._last_sample = None
+            self._last_data = None
+
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
@@ -0,0 +1,104 @@
+"""Diagnostics support for Jebao."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .broker import async_get_broker
+from .const import CONF_INTERFACES, DOMAIN
+from .coordinator import JebaoMD44Coordinator
+from .discovery import async_get_discovery_scheduler
+from .trace import async_get_traces
+
+TO_REDACT = {"mac_address"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Everything comes from the live session and coordinator; no extra
+    connection to the pump is opened.
+    """
+    broker = async_get_broker(hass)
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+    }
+
+    scheduler = async_get_discovery_scheduler(hass)
+    if scheduler is not None:
+        stored = entry.data.get(CONF_INTERFACES)
+        diagnostics["discovery"] = {
+            iface: stats.as_dict()
+            for iface, stats in scheduler.interface_stats.items()
+            if not stored or iface in stored
+        }
+
+    trace = async_get_traces(hass).get(entry.entry_id)
+    if trace is not None:
+        # Frames captured with the jebao.trace service (login passcode blanked)
+        diagnostics["trace"] = trace.as_dict()
+
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if data is None:
+        # Not loaded; connect stats may still explain why
+        stats = broker.stats.get(entry.data[CONF_HOST])
+        diagnostics["connection"] = stats.as_dict() if stats else None
+        return diagnostics
+
+    device = data["device"]
+    coordinator = data["coordinator"]
+    stats = broker.stats.get(device.host)
+    diagnostics["device"] = {
+        "host": device.host,
+        "connected": device.is_connected,
+    }
+    # Request budgets and the queueing they caused
+    diagnostics["throttle"] = data["throttle"].as_dict()
+
+    if isinstance(coordinator, JebaoMD44Coordinator):
+        # The status layout is unconfirmed, so include the raw frame
+        diagnostics["device"]["raw_status"] = (
+            device.raw_status.hex() if device.raw_status else None
+        )
+        diagnostics["coordinator"] = {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "last_poll_duration": coordinator.last_poll_duration,
+            "requests": coordinator.requests.as_dict(),
+            "availability": coordinator.availability.as_dict(),
+        }
+        diagnostics["connection"] = stats.as_dict() if stats else None
+        return diagnostics
+
+    snapshot = dict(coordinator.data or {})
+    if snapshot.get("state") is not None:
+        snapshot["state"] = snapshot["state"].name
+    feed_ends_at = coordinator.feed_ends_at
+
+    diagnostics["coordinator"] = {
+        "last_update_success": coordinator.last_update_success,
+        "update_interval": coordinator.update_interval.total_seconds()
+        if coordinator.update_interval
+        else None,
+        "data": snapshot,
+        "desired": coordinator.desired,
+        "drift_corrections": coordinator.drift_corrections,
+        "requests": coordinator.requests.as_dict(),
+        "availability": coordinator.availability.as_dict(),
+        "feed_duration": coordinator.feed_duration,
+        "feed_ends_at": feed_ends_at.isoformat() if feed_ends_at else None,
+    }
+    diagnostics["connection"] = stats.as_dict() if stats else None
+    return diagnostics
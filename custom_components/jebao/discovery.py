@@ -0,0 +1,354 @@
+"""Background discovery for Jebao pumps.
+
+Runs the periodic UDP broadcast scan that finds new pumps and backfills
+MAC/IP on existing entries. Scans run often only while a configured pump is
+missing or unreachable and back off to a long interval once every pump is
+healthy. Discovery flows are only started for pumps that have no entry
+(including ignored ones) and no flow already in progress.
+
+Each scan broadcasts on the interfaces chosen during setup (or on every
+interface if an entry predates that choice), one concurrent scan per
+interface with its own timeout. Interfaces that keep coming back empty are
+pruned from routine scans and re-probed now and then.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Any, Optional
+
+from jebao import DiscoveredDevice, discover_devices
+
+from homeassistant.config_entries import SOURCE_IGNORE, SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.const import CONF_HOST
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import CONF_INTERFACES, DATA_DISCOVERY, DOMAIN
+from .index import async_get_index
+
+_LOGGER = logging.getLogger(__name__)
+
+# Scan interval while a configured pump is missing or unreachable
+DISCOVERY_INTERVAL = timedelta(minutes=5)
+# Scan interval once every configured pump is reachable
+DISCOVERY_IDLE_INTERVAL = timedelta(hours=1)
+
+DISCOVERY_TIMEOUT = 5.0
+# Extra time an interface scan gets before it is abandoned
+DISCOVERY_TIMEOUT_GRACE = 2.0
+
+# Consecutive empty or failed scans before an interface is pruned
+PRUNE_AFTER_SCANS = 6
+# Pruned interfaces are scanned again every this many scans
+REPROBE_EVERY_SCANS = 12
+
+
+@dataclass
+class InterfaceStats:
+    """Scan statistics for one network interface."""
+
+    scans: int = 0
+    failures: int = 0
+    devices_found: int = 0
+    consecutive_empty: int = 0
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+
+    @property
+    def pruned(self) -> bool:
+        """Return True if routine scans skip this interface."""
+        return self.consecutive_empty >= PRUNE_AFTER_SCANS
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {**asdict(self), "pruned": self.pruned}
+
+
+def get_ipv4_interfaces() -> list[str]:
+    """Return the names of non-loopback interfaces with an IPv4 address.
+
+    Runs in the executor; netifaces is only imported once a scan needs it.
+    """
+    import netifaces  # pylint: disable=import-outside-toplevel
+
+    interfaces = []
+    try:
+        for iface in netifaces.interfaces():
+            if iface.startswith("lo"):
+                continue
+            if netifaces.AF_INET in netifaces.ifaddresses(iface):
+                interfaces.append(iface)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.error("Error enumerating interfaces: %s", err)
+    return interfaces
+
+
+class JebaoDiscoveryScheduler:
+    """Schedule and run background discovery scans."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize scheduler."""
+        self.hass = hass
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self._scan_task: Optional[asyncio.Task] = None
+        self._next_scan: Optional[float] = None
+        self._stopped = False
+        self._scan_count = 0
+        self._full_scan_requested = False
+        self.interface_stats: dict[str, InterfaceStats] = {}
+
+    @callback
+    def async_start(self) -> None:
+        """Run the first scan now; later scans schedule themselves."""
+        self._start_scan()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the scan timer and any scan in progress."""
+        self._stopped = True
+        self._cancel_timer()
+        if self._scan_in_progress:
+            self._scan_task.cancel()
+        self._scan_task = None
+
+    @callback
+    def async_request_scan(self) -> None:
+        """Bring the next scan forward because a configured pump went missing."""
+        if self._stopped or self._scan_in_progress:
+            return
+        if (
+            self._next_scan is not None
+            and self._next_scan - time.monotonic() <= DISCOVERY_INTERVAL.total_seconds()
+        ):
+            return
+        _LOGGER.debug("Pump unreachable, shortening discovery interval")
+        self._full_scan_requested = True
+        self._schedule(DISCOVERY_INTERVAL)
+
+    async def async_scan(self) -> None:
+        """Run a full scan now (or join the one in progress) and wait for it.
+
+        Results land in the device index, like those of scheduled scans.
+        """
+        if self._stopped:
+            return
+        if not self._scan_in_progress:
+            self._cancel_timer()
+            self._full_scan_requested = True
+            self._start_scan()
+        if self._scan_task is not None:
+            await asyncio.shield(self._scan_task)
+
+    @property
+    def _scan_in_progress(self) -> bool:
+        """Return True while a scan task is running."""
+        return self._scan_task is not None and not self._scan_task.done()
+
+    @callback
+    def _start_scan(self) -> None:
+        """Start a scan in the background."""
+        self._next_scan = None
+        self._scan_task = self.hass.async_create_background_task(
+            self._async_scan(), "jebao_discovery"
+        )
+
+    @callback
+    def _schedule(self, delay: timedelta) -> None:
+        """Schedule the next scan."""
+        self._cancel_timer()
+        self._next_scan = time.monotonic() + delay.total_seconds()
+        self._unsub_timer = async_call_later(
+            self.hass, delay, HassJob(self._async_timer_fired, cancel_on_shutdown=True)
+        )
+
+    @callback
+    def _cancel_timer(self) -> None:
+        """Cancel the scheduled scan."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_timer_fired(self, _now: datetime) -> None:
+        """Run a scheduled scan."""
+        self._unsub_timer = None
+        self._start_scan()
+
+    def _all_reachable(self) -> bool:
+        """Return True if every active entry is loaded and polling fine."""
+        domain_data: dict[str, Any] = self.hass.data.get(DOMAIN, {})
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            if entry.source == SOURCE_IGNORE or entry.disabled_by:
+                continue
+            data = domain_data.get(entry.entry_id)
+            if data is None or not data["coordinator"].last_update_success:
+                return False
+        return True
+
+    async def _async_scan(self) -> None:
+        """Scan, then schedule the next scan based on pump health."""
+        try:
+            await self._async_discover()
+        finally:
+            if not self._stopped:
+                self._schedule(
+                    DISCOVERY_IDLE_INTERVAL
+                    if self._all_reachable()
+                    else DISCOVERY_INTERVAL
+                )
+
+    def _flow_in_progress(self, device_id: str) -> bool:
+        """Return True if a config flow for this pump is already open."""
+        return any(
+            flow["context"].get("unique_id") == device_id
+            for flow in self.hass.config_entries.flow.async_progress_by_handler(
+                DOMAIN, include_uninitialized=True
+            )
+        )
+
+    async def _async_interfaces(self) -> list[str]:
+        """Return the interfaces to scan this time.
+
+        Uses the interfaces stored on the entries; an entry without a stored
+        choice (set up manually or before interfaces were stored) widens the
+        scan to every interface. Pruned interfaces are skipped unless this
+        scan re-probes them or a pump went missing.
+        """
+        interfaces: set[str] = set()
+        scan_all = False
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            if entry.source == SOURCE_IGNORE:
+                continue
+            stored = entry.data.get(CONF_INTERFACES)
+            if not stored:
+                scan_all = True
+                break
+            interfaces.update(stored)
+
+        available = await self.hass.async_add_executor_job(get_ipv4_interfaces)
+        if interfaces and not scan_all:
+            available = [iface for iface in available if iface in interfaces]
+
+        reprobe = self._full_scan_requested or (
+            self._scan_count % REPROBE_EVERY_SCANS == 0
+        )
+        self._full_scan_requested = False
+        if reprobe:
+            return available
+        return [
+            iface
+            for iface in available
+            if not self.interface_stats.setdefault(iface, InterfaceStats()).pruned
+        ]
+
+    async def _async_scan_interface(
+        self, interface: str
+    ) -> list[DiscoveredDevice]:
+        """Scan one interface, recording how it went."""
+        stats = self.interface_stats.setdefault(interface, InterfaceStats())
+        stats.scans += 1
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(DISCOVERY_TIMEOUT + DISCOVERY_TIMEOUT_GRACE):
+                devices = await discover_devices(
+                    timeout=DISCOVERY_TIMEOUT, interfaces=[interface]
+                )
+        except Exception as err:  # pylint: disable=broad-except
+            stats.failures += 1
+            stats.consecutive_empty += 1
+            stats.last_error = str(err) or type(err).__name__
+            _LOGGER.debug("Discovery on %s failed: %s", interface, err)
+            return []
+        finally:
+            stats.last_duration = time.monotonic() - start
+
+        stats.devices_found = len(devices)
+        if devices:
+            stats.consecutive_empty = 0
+        else:
+            stats.consecutive_empty += 1
+            if stats.consecutive_empty == PRUNE_AFTER_SCANS:
+                _LOGGER.info(
+                    "No pumps seen on %s for %d scans, only re-probing it from now on",
+                    interface,
+                    PRUNE_AFTER_SCANS,
+                )
+        return devices
+
+    async def _async_discover(self) -> None:
+        """Scan every interface concurrently and act on the results."""
+        interfaces = await self._async_interfaces()
+        self._scan_count += 1
+        if not interfaces:
+            _LOGGER.debug("No interfaces to scan for Jebao pumps")
+            return
+
+        results = await asyncio.gather(
+            *(self._async_scan_interface(iface) for iface in interfaces)
+        )
+        found: dict[str, tuple[DiscoveredDevice, str]] = {}
+        for interface, devices in zip(interfaces, results):
+            for device in devices:
+                found.setdefault(device.device_id, (device, interface))
+
+        index = async_get_index(self.hass)
+        index.async_record_discovered(device for device, _ in found.values())
+
+        for device, interface in found.values():
+            if not (device.is_mdp20000 or device.is_md44):
+                continue
+
+            existing = index.async_get_entry(device_id=device.device_id)
+            if existing is not None:
+                if existing.source == SOURCE_IGNORE:
+                    continue  # User doesn't want this pump
+
+                # Backfill missing MAC / update IP if it drifted (DHCP discovery is the
+                # preferred IP-recovery path, but periodic scan is a belt-and-suspenders).
+                updates: dict[str, Any] = {}
+                if not existing.data.get("mac_address") and device.mac_address:
+                    updates["mac_address"] = device.mac_address
+                if existing.data.get(CONF_HOST) != device.ip_address:
+                    updates[CONF_HOST] = device.ip_address
+                if updates:
+                    _LOGGER.info(
+                        "Updating Jebao entry %s from periodic discovery: %s",
+                        existing.title,
+                        updates,
+                    )
+                    self.hass.config_entries.async_update_entry(
+                        existing, data={**existing.data, **updates}
+                    )
+                continue
+
+            if self._flow_in_progress(device.device_id):
+                continue
+
+            # New, unconfigured pump - kick off a discovery flow so it appears
+            # in Settings -> Devices & Services as "Discovered".
+            _LOGGER.debug("Starting discovery flow for new pump %s", device.device_id)
+            self.hass.async_create_task(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                    data={
+                        "device_id": device.device_id,
+                        "ip": device.ip_address,
+                        "model": device.model,
+                        "mac_address": device.mac_address,
+                        CONF_INTERFACES: [interface],
+                    },
+                )
+            )
+
+
+@callback
+def async_get_discovery_scheduler(
+    hass: HomeAssistant,
+) -> Optional[JebaoDiscoveryScheduler]:
+    """Return the background discovery scheduler, if it is running."""
+    return hass.data.get(DOMAIN, {}).get(DATA_DISCOVERY)
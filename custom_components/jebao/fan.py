@@ -15,15 +15,12 @@ from homeassistant.util.percentage import (
     ranged_value_to_percentage,
 )
 
-from .const import CONF_DEVICE_ID, CONF_MODEL, DOMAIN
+from .const import CONF_DEVICE_ID, CONF_MODEL, DOMAIN, SPEED_RANGE
 from .coordinator import JebaoDataUpdateCoordinator
 from .entity import JebaoEntity
 
 _LOGGER = logging.getLogger(__name__)
 
-# MDP-20000 speed range is 30-100
-SPEED_RANGE = (30, 100)
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -32,25 +29,16 @@ async def async_setup_entry(
 ) -> None:
     """Set up Jebao fan from config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    device = data["device"]
     device_id = data["device_id"]
     model = data["model"]
     host = data["host"]
     mac_address = data.get("mac_address")
     firmware_version = data.get("firmware_version")
 
-    # Create coordinator
-    scan_interval = entry.options.get("scan_interval")
-    if scan_interval:
-        coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id, scan_interval)
-    else:
-        coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id)
-
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    coordinator: JebaoDataUpdateCoordinator = data["coordinator"]
 
     # Create fan entity
-    async_add_entities([JebaoPumpFan(coordinator, device_id, model, host, device, mac_address, firmware_version)])
+    async_add_entities([JebaoPumpFan(coordinator, device_id, model, host, mac_address, firmware_version)])
 
 
 class JebaoPumpFan(JebaoEntity, FanEntity):
@@ -59,6 +47,8 @@ class JebaoPumpFan(JebaoEntity, FanEntity):
     _attr_supported_features = (
         FanEntityFeature.SET_SPEED | FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF
     )
+    # Flips at the start and end of a stale episode; not worth an attributes row
+    _unrecorded_attributes = frozenset({"stale"})
     _attr_translation_key = "pump"
 
     def __init__(
@@ -67,13 +57,11 @@ class JebaoPumpFan(JebaoEntity, FanEntity):
         device_id: str,
         model: str,
         host: str,
-        device,
         mac_address: str | None = None,
         firmware_version: str | None = None,
     ) -> None:
         """Initialize fan."""
         super().__init__(coordinator, device_id, model, host, mac_address, firmware_version)
-        self._device = device
         self._attr_unique_id = f"{device_id}_fan"
         self._attr_name = "Pump"
 
@@ -95,8 +83,6 @@ class JebaoPumpFan(JebaoEntity, FanEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
-        from jebao import DeviceState
-
         state = self.coordinator.data.get("state")
         attrs = {
             "device_state": state.name if state else "unknown",
@@ -107,6 +93,10 @@ class JebaoPumpFan(JebaoEntity, FanEntity):
         if self.coordinator.data.get("is_feed_mode"):
             attrs["feed_mode"] = True
 
+        # Last values kept while the pump is not answering
+        if self.coordinator.availability.stale:
+            attrs["stale"] = True
+
         return attrs
 
     async def async_turn_on(
@@ -117,13 +107,12 @@ class JebaoPumpFan(JebaoEntity, FanEntity):
     ) -> None:
         """Turn on the pump."""
         try:
-            await self._device.turn_on()
-
+            speed = None
             if percentage is not None:
                 # Convert percentage (0-100) to device speed (30-100)
                 speed = round(percentage_to_ranged_value(SPEED_RANGE, percentage))
-                await self._device.set_speed(speed)
 
+            await self.coordinator.async_set_desired(is_on=True, speed=speed)
             await self.coordinator.async_request_refresh()
 
         except JebaoError as err:
@@ -132,7 +121,7 @@ class JebaoPumpFan(JebaoEntity, FanEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the pump."""
         try:
-            await self._device.turn_off()
+            await self.coordinator.async_set_desired(is_on=False)
             await self.coordinator.async_request_refresh()
 
         except JebaoError as err:
@@ -145,9 +134,7 @@ class JebaoPumpFan(JebaoEntity, FanEntity):
             return
 
         try:
-            # Convert percentage (0-100) to device speed (30-100)
-            speed = round(percentage_to_ranged_value(SPEED_RANGE, percentage))
-            await self._device.set_speed(speed)
+            await self.coordinator.async_send_percentage(percentage)
             await self.coordinator.async_request_refresh()
 
         except JebaoError as err:
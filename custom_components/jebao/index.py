@@ -0,0 +1,199 @@
+"""Domain-wide index of Jebao config entries.
+
+Maps normalized MAC address, device_id and current IP to config entries so
+DHCP handling, periodic discovery and IP recovery are O(1) lookups instead
+of a walk over every entry. The index follows config entry add, update and
+remove signals, so it stays current no matter which code path changed an
+entry. It also holds the live session of each loaded entry and the latest
+discovery sighting of each pump, so IP recovery reads the shared scan's
+results instead of running a scan of its own.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+import time
+from typing import NamedTuple, Optional
+
+from jebao import DiscoveredDevice, JebaoDevice
+
+from homeassistant.config_entries import (
+    SIGNAL_CONFIG_ENTRY_CHANGED,
+    ConfigEntry,
+    ConfigEntryChange,
+)
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import CONF_DEVICE_ID, DATA_INDEX, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalize_mac(mac: Optional[str]) -> str:
+    """Normalize a MAC address for comparison (lowercase, no separators)."""
+    return (mac or "").lower().replace(":", "").replace("-", "")
+
+
+class _IndexKeys(NamedTuple):
+    """Keys an entry is currently indexed under."""
+
+    mac: str
+    device_id: Optional[str]
+    host: Optional[str]
+
+
+class JebaoDeviceIndex:
+    """Incrementally maintained lookup tables for Jebao config entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize index."""
+        self.hass = hass
+        self._by_mac: dict[str, str] = {}
+        self._by_device_id: dict[str, str] = {}
+        self._by_host: dict[str, str] = {}
+        self._keys: dict[str, _IndexKeys] = {}
+        # Live sessions of loaded entries, by entry_id
+        self._devices: dict[str, JebaoDevice] = {}
+        # Latest discovery reply per device_id, with when it was seen
+        self._discovered: dict[str, tuple[DiscoveredDevice, float]] = {}
+
+    @callback
+    def async_start(self) -> None:
+        """Index existing entries and follow config entry changes."""
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            self.async_update_entry(entry)
+        async_dispatcher_connect(
+            self.hass, SIGNAL_CONFIG_ENTRY_CHANGED, self._async_entry_changed
+        )
+
+    @callback
+    def _async_entry_changed(
+        self, change: ConfigEntryChange, entry: ConfigEntry
+    ) -> None:
+        """Keep the index in sync with config entry changes."""
+        if entry.domain != DOMAIN:
+            return
+        if change == ConfigEntryChange.REMOVED:
+            self.async_remove_entry(entry.entry_id)
+            self._devices.pop(entry.entry_id, None)
+        else:
+            self.async_update_entry(entry)
+
+    @callback
+    def async_update_entry(self, entry: ConfigEntry) -> None:
+        """Index (or re-index) an entry under its current keys."""
+        keys = _IndexKeys(
+            normalize_mac(entry.data.get("mac_address")),
+            entry.data.get(CONF_DEVICE_ID) or entry.unique_id,
+            entry.data.get(CONF_HOST),
+        )
+        if self._keys.get(entry.entry_id) == keys:
+            return  # Nothing we index changed (e.g. a state change)
+
+        self.async_remove_entry(entry.entry_id)
+        self._keys[entry.entry_id] = keys
+        if keys.mac:
+            self._by_mac[keys.mac] = entry.entry_id
+        if keys.device_id:
+            self._by_device_id[keys.device_id] = entry.entry_id
+        if keys.host:
+            self._by_host[keys.host] = entry.entry_id
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Drop an entry from the index."""
+        keys = self._keys.pop(entry_id, None)
+        if keys is None:
+            return
+        for table, key in (
+            (self._by_mac, keys.mac),
+            (self._by_device_id, keys.device_id),
+            (self._by_host, keys.host),
+        ):
+            if key and table.get(key) == entry_id:
+                del table[key]
+
+    @callback
+    def _async_lookup(
+        self,
+        mac: Optional[str],
+        device_id: Optional[str],
+        host: Optional[str],
+    ) -> Optional[str]:
+        """Return the entry_id for the first key given."""
+        if mac is not None:
+            return self._by_mac.get(normalize_mac(mac))
+        if device_id is not None:
+            return self._by_device_id.get(device_id)
+        if host is not None:
+            return self._by_host.get(host)
+        return None
+
+    @callback
+    def async_get_entry(
+        self,
+        *,
+        mac: Optional[str] = None,
+        device_id: Optional[str] = None,
+        host: Optional[str] = None,
+    ) -> Optional[ConfigEntry]:
+        """Look up an entry by MAC, device_id or host (first key given wins)."""
+        entry_id = self._async_lookup(mac, device_id, host)
+        if entry_id is None:
+            return None
+        return self.hass.config_entries.async_get_entry(entry_id)
+
+    @callback
+    def async_set_device(self, entry_id: str, device: Optional[JebaoDevice]) -> None:
+        """Attach a loaded entry's live session (None when it unloads)."""
+        if device is None:
+            self._devices.pop(entry_id, None)
+        else:
+            self._devices[entry_id] = device
+
+    @callback
+    def async_get_device(
+        self,
+        *,
+        mac: Optional[str] = None,
+        device_id: Optional[str] = None,
+        host: Optional[str] = None,
+    ) -> Optional[JebaoDevice]:
+        """Look up a loaded entry's live session by MAC, device_id or host."""
+        entry_id = self._async_lookup(mac, device_id, host)
+        if entry_id is None:
+            return None
+        return self._devices.get(entry_id)
+
+    @callback
+    def async_record_discovered(self, devices: Iterable[DiscoveredDevice]) -> None:
+        """Record the pumps that answered a discovery scan."""
+        now = time.monotonic()
+        for device in devices:
+            self._discovered[device.device_id] = (device, now)
+
+    @callback
+    def async_get_discovered(
+        self, device_id: str, max_age: Optional[float] = None
+    ) -> Optional[DiscoveredDevice]:
+        """Return a pump's latest discovery reply, if not older than max_age."""
+        sighting = self._discovered.get(device_id)
+        if sighting is None:
+            return None
+        device, seen = sighting
+        if max_age is not None and time.monotonic() - seen > max_age:
+            return None
+        return device
+
+
+@callback
+def async_get_index(hass: HomeAssistant) -> JebaoDeviceIndex:
+    """Return the domain-wide device index, building it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_INDEX not in domain_data:
+        index = JebaoDeviceIndex(hass)
+        index.async_start()
+        domain_data[DATA_INDEX] = index
+    return domain_data[DATA_INDEX]
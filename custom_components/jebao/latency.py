@@ -0,0 +1,195 @@
+"""Latency-aware requests for Jebao pumps.
+
+python-jebao waits a fixed 5 s for every reply and retries its commands
+blindly (up to three attempts with backoff, the non-idempotent feed start
+included). On a marginal Wi-Fi link one lost frame then costs a full
+timeout, or several, and fails the poll.
+
+The coordinators send each request once instead, with a deadline derived
+from the round-trip times the pump has actually shown (a multiple of the
+recent p95). When the deadline passes, an idempotent request (status read,
+on/off, speed, leaving Program mode) is sent again with the library's full
+timeout, as long as the retry budget allows; each request earns a fraction
+of a retry, so retries stay a bounded share of the traffic on a link that
+is down rather than lossy. The pump's session carries one request at a
+time, so the second attempt cannot race the first the way a hedged request
+would; it replaces it, and a late reply to the first attempt is consumed
+by the second. Feed start is never repeated.
+
+Round trips are timed from when the pump's token bucket lets the request
+through, so queueing behind the budget does not inflate the deadline. The
+library's retries also reconnected a dropped session; an idempotent request
+that finds the session closed reconnects and is sent again here instead,
+under the same deadline and drawing on the same retry budget.
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+import functools
+import logging
+import statistics
+import time
+from typing import Any, Optional
+
+from jebao import JebaoConnectionError, JebaoTimeoutError
+from jebao.const import DEFAULT_TIMEOUT
+
+from .throttle import QUEUE_WAIT
+
+_LOGGER = logging.getLogger(__name__)
+
+# Status-read round trips kept for the percentiles
+RTT_WINDOW = 50
+# Round trips needed before the deadline adapts (until then: the library's)
+MIN_RTT_SAMPLES = 10
+# Deadline as a multiple of the p95 round trip, and its floor
+DEADLINE_FACTOR = 3.0
+MIN_DEADLINE = 0.5  # seconds
+
+# Each request earns this much of a retry, up to RETRY_BUDGET_CAP retries
+RETRY_RATIO = 0.2
+RETRY_BUDGET_CAP = 10.0
+# Retries available before any have been earned (e.g. right after startup)
+RETRY_BUDGET_RESERVE = 3.0
+
+
+def _single_attempt(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Return a device method without python-jebao's built-in retries."""
+    func = getattr(method, "__wrapped__", None)
+    if func is None:
+        return method
+    return functools.partial(func, method.__self__)
+
+
+@dataclass
+class RequestStats:
+    """Outcome counts of one pump's requests."""
+
+    requests: int = 0
+    # First attempts that ran past the deadline
+    timeouts: int = 0
+    retries: int = 0
+    retries_succeeded: int = 0
+    # Timeouts and dropped sessions not retried because the budget was spent
+    retries_denied: int = 0
+    # Retries sent after reopening a dropped session
+    reconnects: int = 0
+    # Feed starts answered by one already in flight or running
+    deduplicated: int = 0
+
+
+class JebaoRequestPolicy:
+    """Deadline and retry budget for one pump's requests."""
+
+    def __init__(self, reconnect: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        """Initialize policy.
+
+        Args:
+            reconnect: Reopens the pump's session when a request finds it
+                dropped
+        """
+        self._reconnect = reconnect
+        self.stats = RequestStats()
+        self._rtts: deque[float] = deque(maxlen=RTT_WINDOW)
+        self._budget = RETRY_BUDGET_RESERVE
+
+    def percentile(self, percent: int) -> Optional[float]:
+        """Return a percentile of the recent round trips, in seconds."""
+        if len(self._rtts) < 2:
+            return None
+        return statistics.quantiles(self._rtts, n=100, method="inclusive")[percent - 1]
+
+    @property
+    def deadline(self) -> float:
+        """Return how long a first attempt waits for its reply."""
+        if len(self._rtts) < MIN_RTT_SAMPLES:
+            return DEFAULT_TIMEOUT
+        p95 = self.percentile(95) or DEFAULT_TIMEOUT
+        return min(DEFAULT_TIMEOUT, max(MIN_DEADLINE, DEADLINE_FACTOR * p95))
+
+    async def async_send(
+        self,
+        method: Callable[..., Awaitable[Any]],
+        *args: Any,
+        idempotent: bool = True,
+        sample: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """Send one device request under the deadline and retry budget.
+
+        Args:
+            method: Bound device method taking a timeout keyword
+            idempotent: Whether sending it twice is harmless
+            sample: Record the round trip (plain status reads only)
+
+        Raises:
+            JebaoError: The request (and its retry, if any) failed
+        """
+        call = _single_attempt(method)
+        stats = self.stats
+        stats.requests += 1
+        self._budget = min(RETRY_BUDGET_CAP, self._budget + RETRY_RATIO)
+
+        deadline = self.deadline
+        QUEUE_WAIT.set(0.0)
+        start = time.monotonic()
+        try:
+            result = await call(*args, timeout=deadline, **kwargs)
+        except JebaoConnectionError:
+            device = getattr(method, "__self__", None)
+            if (
+                not idempotent
+                or self._reconnect is None
+                or device is None
+                or device.is_connected
+            ):
+                raise
+            if self._budget < 1:
+                stats.retries_denied += 1
+                raise
+            self._budget -= 1
+            stats.retries += 1
+            stats.reconnects += 1
+            _LOGGER.debug(
+                "Session dropped during %s, reconnecting",
+                getattr(method, "__name__", "request"),
+            )
+            await self._reconnect()
+            result = await call(*args, timeout=deadline, **kwargs)
+            stats.retries_succeeded += 1
+            return result
+        except JebaoTimeoutError:
+            stats.timeouts += 1
+            if not idempotent:
+                raise
+            if self._budget < 1:
+                stats.retries_denied += 1
+                raise
+            self._budget -= 1
+            stats.retries += 1
+            _LOGGER.debug(
+                "%s got no reply within %.2f s, sending it again",
+                getattr(method, "__name__", "request"),
+                deadline,
+            )
+            result = await call(*args, **kwargs)
+            stats.retries_succeeded += 1
+            return result
+
+        if sample:
+            # Time spent queued for a token is not part of the round trip
+            self._rtts.append(time.monotonic() - start - QUEUE_WAIT.get())
+        return result
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the latency and retry state for diagnostics."""
+        return {
+            "rtt_samples": len(self._rtts),
+            "rtt_p50": self.percentile(50),
+            "rtt_p95": self.percentile(95),
+            "deadline": self.deadline,
+            "retry_budget": round(self._budget, 2),
+            **asdict(self.stats),
+        }
@@ -0,0 +1,70 @@
+"""MD-4.4 dosing pump support for Jebao.
+
+python-jebao only ships a device class for the MDP-20000, so the MD-4.4 is
+driven here on top of the library's generic device and protocol, with the
+same single status request (0x90/02) the MDP-20000 uses.
+
+The layout of the MD-4.4's status frame is not documented and has not been
+confirmed against captures from real dosers, so the frame is not decoded:
+it is kept raw for diagnostics (and protocol traces) until the layout is
+known, and no channel entities are built on it. Nothing is ever written to
+an MD-4.4.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Optional
+
+from jebao import (
+    MODEL_MD44,
+    JebaoCommandError,
+    JebaoConnectionError,
+    JebaoDevice,
+)
+from jebao.const import DEFAULT_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MD44Device(JebaoDevice):
+    """Read-only Jebao MD-4.4 four-channel dosing pump."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 12416,
+        device_id: Optional[str] = None,
+    ) -> None:
+        """Initialize device."""
+        super().__init__(host, port, device_id, MODEL_MD44)
+        self.raw_status: Optional[bytes] = None
+
+    def set_host(self, host: str) -> None:
+        """Point the device (and its protocol) at a new IP address."""
+        self.host = host
+        self._protocol.host = host
+
+    async def update(self, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """Read the raw status frame.
+
+        Raises:
+            JebaoConnectionError: Not connected
+            JebaoTimeoutError: Request timed out
+            JebaoCommandError: Empty response
+        """
+        if not self.is_connected:
+            raise JebaoConnectionError("Not connected")
+
+        response = await self._protocol.request_status(timeout)
+        if not response:
+            raise JebaoCommandError("MD-4.4 sent an empty status frame")
+
+        self.raw_status = response
+        self._last_update = time.time()
+        _LOGGER.debug(
+            "%s Status updated: %d bytes: %s",
+            self.device_identifier,
+            len(response),
+            response.hex(),
+        )
@@ -5,7 +5,7 @@ import logging
 
 from jebao import JebaoError
 
-from homeassistant.components.number import NumberEntity, NumberMode
+from homeassistant.components.number import NumberMode, RestoreNumber
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTime
 from homeassistant.core import HomeAssistant
@@ -25,35 +25,28 @@ async def async_setup_entry(
 ) -> None:
     """Set up Jebao number entities from config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    device = data["device"]
     device_id = data["device_id"]
     model = data["model"]
     host = data["host"]
     mac_address = data.get("mac_address")
     firmware_version = data.get("firmware_version")
 
-    # Get or create coordinator
-    if "coordinator" not in data:
-        scan_interval = entry.options.get("scan_interval")
-        if scan_interval:
-            coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id, scan_interval)
-        else:
-            coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id)
-        await coordinator.async_config_entry_first_refresh()
-        data["coordinator"] = coordinator
-    else:
-        coordinator = data["coordinator"]
+    coordinator: JebaoDataUpdateCoordinator = data["coordinator"]
 
     # Create number entities
     async_add_entities(
         [
-            JebaoFeedDurationNumber(coordinator, device_id, model, host, device, mac_address, firmware_version),
+            JebaoFeedDurationNumber(coordinator, device_id, model, host, mac_address, firmware_version),
         ]
     )
 
 
-class JebaoFeedDurationNumber(JebaoEntity, NumberEntity):
-    """Number entity for feed duration."""
+class JebaoFeedDurationNumber(JebaoEntity, RestoreNumber):
+    """Number entity for feed duration.
+
+    The pump doesn't report its feed timer, so the last value set is restored
+    after a restart and kept on the coordinator for feed end tracking.
+    """
 
     _attr_translation_key = "feed_duration"
     _attr_native_unit_of_measurement = UnitOfTime.MINUTES
@@ -68,29 +61,32 @@ class JebaoFeedDurationNumber(JebaoEntity, NumberEntity):
         device_id: str,
         model: str,
         host: str,
-        device,
         mac_address: str | None = None,
         firmware_version: str | None = None,
     ) -> None:
         """Initialize number entity."""
         super().__init__(coordinator, device_id, model, host, mac_address, firmware_version)
-        self._device = device
         self._attr_unique_id = f"{device_id}_feed_duration"
         self._attr_name = "Feed duration"
         self._attr_icon = "mdi:timer"
-        self._value = 1  # Default value
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last configured duration."""
+        await super().async_added_to_hass()
+        last_data = await self.async_get_last_number_data()
+        if last_data is not None and last_data.native_value is not None:
+            self.coordinator.feed_duration = int(last_data.native_value)
 
     @property
     def native_value(self) -> float:
         """Return the current value."""
-        return self._value
+        return self.coordinator.feed_duration
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
         try:
             minutes = int(value)
-            await self._device.set_feed_duration(minutes)
-            self._value = minutes
+            await self.coordinator.async_set_feed_duration(minutes)
             self.async_write_ha_state()
             _LOGGER.info("Feed duration set to %d minutes", minutes)
 
@@ -0,0 +1,105 @@
+"""Unicast discovery probe for a single Jebao pump.
+
+Sends the UDP discovery request straight to one host instead of
+broadcasting. A pump answers within milliseconds with its device_id, model
+and MAC address, so a manually entered IP can be checked (and identified)
+without a TCP session, and a wrong IP fails in about a second instead of
+running into the TCP connect timeout.
+
+The request is sent from the port python-jebao's discovery (and the
+official app) uses, since pumps may only answer requests from it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+from typing import Optional
+
+from jebao import DiscoveredDevice, JebaoDiscovery
+from jebao.const import UDP_DISCOVERY_PORT
+
+_LOGGER = logging.getLogger(__name__)
+
+# Total time to wait for a reply, and how often the request is resent
+PROBE_TIMEOUT = 1.5
+PROBE_RESEND_INTERVAL = 0.5
+
+# Source port of python-jebao's discovery requests
+DISCOVERY_SOURCE_PORT = 37479
+
+
+class _ProbeProtocol(asyncio.DatagramProtocol):
+    """Resolve a future with the first discovery reply from the host."""
+
+    def __init__(self, future: asyncio.Future[Optional[DiscoveredDevice]]) -> None:
+        """Initialize protocol."""
+        self._future = future
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Parse a reply (the socket only accepts datagrams from the host)."""
+        device = JebaoDiscovery._parse_discovery_response(  # noqa: SLF001
+            data, addr[0]
+        )
+        if device is not None and not self._future.done():
+            self._future.set_result(device)
+
+    def error_received(self, exc: Exception) -> None:
+        """Give up early when the host reports the port unreachable."""
+        _LOGGER.debug("Probe error: %s", exc)
+        if not self._future.done():
+            self._future.set_result(None)
+
+
+def _bind_socket(remote: tuple[str, int]) -> socket.socket:
+    """Return a socket on the discovery source port, connected to the pump.
+
+    SO_REUSEADDR, as the library sets on its scan sockets, lets a probe and
+    a scan share the port; the kernel hands the pump's replies to the
+    connected probe socket.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("0.0.0.0", DISCOVERY_SOURCE_PORT))
+        sock.connect(remote)
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+async def async_probe(
+    host: str, timeout: float = PROBE_TIMEOUT
+) -> Optional[DiscoveredDevice]:
+    """Probe one host for a Jebao pump.
+
+    Returns:
+        The discovered device, or None if nothing answered in time
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[Optional[DiscoveredDevice]] = loop.create_future()
+    try:
+        addresses = await loop.getaddrinfo(
+            host, UDP_DISCOVERY_PORT, family=socket.AF_INET, type=socket.SOCK_DGRAM
+        )
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _ProbeProtocol(future), sock=_bind_socket(addresses[0][4])
+        )
+    except OSError as err:
+        _LOGGER.debug("Cannot probe %s: %s", host, err)
+        return None
+
+    try:
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            # UDP may be dropped, so resend until the deadline
+            transport.sendto(JebaoDiscovery.DISCOVERY_REQUEST)
+            await asyncio.wait({future}, timeout=min(PROBE_RESEND_INTERVAL, remaining))
+            if future.done():
+                return future.result()
+        _LOGGER.debug("No probe reply from %s within %.1fs", host, timeout)
+        return None
+    finally:
+        transport.close()
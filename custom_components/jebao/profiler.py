@@ -0,0 +1,469 @@
+"""Time-boxed profiling for the Jebao integration.
+
+A profile session instruments the integration's hot paths (coordinator
+cycles, pump commands, discovery, connects and the config flow) for a fixed
+time and writes a report to the config directory. Every instrumented call
+is timed end to end and, separately, for the longest stretch it held the
+event loop without yielding; stretches above the blocking threshold are
+logged as they happen so loop stalls can be pinned on one function.
+
+Blocking outside those functions (a platform, a library callback, another
+helper of the integration) is caught at the loop level: a heartbeat task
+measures how late the loop wakes it, and a watchdog thread takes the loop
+thread's stack while a stall is still going on, so the report shows what
+was running. Optionally cProfile runs on the event loop thread as well.
+
+Nothing is patched outside a running session, and the module (with cProfile)
+is only imported when the first session starts.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Generator
+import contextlib
+import cProfile
+from dataclasses import asdict, dataclass
+import functools
+import importlib
+import inspect
+import io
+import logging
+from pathlib import Path
+import pstats
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_PROFILE,
+    DEFAULT_BLOCK_THRESHOLD,
+    DEFAULT_PROFILE_DURATION,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Loop stalls kept in the report (all of them are logged)
+MAX_BLOCKING_RECORDS = 200
+# Rows of cProfile output in the report
+CPROFILE_ROWS = 40
+# How often the loop heartbeat runs during a session
+LAG_SAMPLE_INTERVAL = 0.05  # seconds
+# Innermost frames of the loop thread's stack kept for a stall
+STALL_STACK_DEPTH = 8
+
+# (module, class or None for module-level functions, attribute)
+PROFILE_TARGETS: tuple[tuple[str, Optional[str], str], ...] = (
+    ("coordinator", "JebaoDataUpdateCoordinator", "_async_update_data"),
+    ("coordinator", "JebaoDataUpdateCoordinator", "async_update_listeners"),
+    ("coordinator", "JebaoDataUpdateCoordinator", "async_set_desired"),
+    ("coordinator", "JebaoDataUpdateCoordinator", "async_set_feed_duration"),
+    ("coordinator", "JebaoDataUpdateCoordinator", "async_start_feed"),
+    ("coordinator", "JebaoDataUpdateCoordinator", "async_cancel_feed"),
+    ("coordinator", "JebaoMD44Coordinator", "_async_update_data"),
+    ("coordinator", "JebaoMD44Coordinator", "async_update_listeners"),
+    ("discovery", "JebaoDiscoveryScheduler", "_async_discover"),
+    ("discovery", "JebaoDiscoveryScheduler", "_async_interfaces"),
+    ("discovery", "JebaoDiscoveryScheduler", "_async_scan_interface"),
+    ("broker", "JebaoConnectionBroker", "async_connect"),
+    ("broker", "JebaoConnectionBroker", "async_disconnect"),
+    ("config_flow", "JebaoConfigFlow", "async_step_discover"),
+    ("config_flow", "JebaoConfigFlow", "async_step_select_device"),
+    ("config_flow", "JebaoConfigFlow", "async_step_manual"),
+    ("services", None, "_async_handle_set_group"),
+    ("services", None, "_async_handle_feed_all"),
+)
+
+
+@dataclass
+class FunctionStats:
+    """Timings of one instrumented function."""
+
+    calls: int = 0
+    errors: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+    # Longest stretch a single call held the event loop without yielding
+    longest_hold: float = 0.0
+
+    def add(self, duration: float, hold: float, failed: bool) -> None:
+        """Record one call."""
+        self.calls += 1
+        self.errors += failed
+        self.total += duration
+        self.longest = max(self.longest, duration)
+        self.longest_hold = max(self.longest_hold, hold)
+
+
+class _HoldTimer:
+    """Drive a coroutine, timing each step it runs on the loop."""
+
+    def __init__(
+        self, coro: Awaitable[Any], on_step: Callable[[float], None]
+    ) -> None:
+        """Initialize timer."""
+        self._coro = coro.__await__()
+        self._on_step = on_step
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        """Forward every suspension to the task, timing the runs between."""
+        send: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            start = time.perf_counter()
+            try:
+                if error is not None:
+                    suspended = self._coro.throw(error)
+                else:
+                    suspended = self._coro.send(send)
+            except StopIteration as stop:
+                self._on_step(time.perf_counter() - start)
+                return stop.value
+            except BaseException:
+                self._on_step(time.perf_counter() - start)
+                raise
+            self._on_step(time.perf_counter() - start)
+
+            send, error = None, None
+            try:
+                send = yield suspended
+            except GeneratorExit:
+                self._coro.close()
+                raise
+            except BaseException as err:  # pylint: disable=broad-except
+                error = err
+
+
+class _LoopLagMonitor:
+    """Catch event loop stalls anywhere, not only in instrumented functions."""
+
+    def __init__(
+        self, threshold: float, on_stall: Callable[[float, list[str]], None]
+    ) -> None:
+        """Initialize monitor.
+
+        Args:
+            threshold: Lag in seconds that counts as a stall
+            on_stall: Called on the loop with the lag and the captured stack
+                (innermost frame last; empty if the stall ended before the
+                watchdog saw it)
+        """
+        self._threshold = threshold
+        self._on_stall = on_stall
+        self._beat = time.perf_counter()
+        # Stack taken by the watchdog, with the beat it was overdue after
+        self._stack: tuple[float, list[str]] = (0.0, [])
+        self._loop_thread = 0
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self, hass: HomeAssistant) -> None:
+        """Start the heartbeat and the watchdog (call on the loop)."""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._task = hass.async_create_background_task(
+            self._async_heartbeat(), f"{DOMAIN} profile loop monitor"
+        )
+        threading.Thread(
+            target=self._watch, name=f"{DOMAIN}_profile_watchdog", daemon=True
+        ).start()
+
+    async def async_stop(self) -> None:
+        """Stop both; the watchdog exits within one check interval."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _async_heartbeat(self) -> None:
+        """Measure how late the loop runs each sleep's wake-up."""
+        while True:
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            now = time.perf_counter()
+            beat, self._beat = self._beat, now
+            lag = now - beat - LAG_SAMPLE_INTERVAL
+            if lag >= self._threshold:
+                taken_after, stack = self._stack
+                self._on_stall(lag, stack if taken_after == beat else [])
+
+    def _watch(self) -> None:
+        """Take the loop thread's stack once per stall, while it lasts.
+
+        The stack is taken halfway to the threshold, so a stall that only
+        just reaches it still has one.
+        """
+        captured: Optional[float] = None
+        interval = min(LAG_SAMPLE_INTERVAL, self._threshold / 2)
+        while not self._stop.wait(interval):
+            beat = self._beat
+            if beat == captured:
+                continue
+            if time.perf_counter() - beat < LAG_SAMPLE_INTERVAL + self._threshold / 2:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)  # noqa: SLF001
+            if frame is None:
+                continue
+            self._stack = (
+                beat,
+                [
+                    f"{entry.filename}:{entry.lineno} {entry.name}"
+                    for entry in traceback.extract_stack(frame)[-STALL_STACK_DEPTH:]
+                ],
+            )
+            captured = beat
+
+
+class JebaoProfiler:
+    """One profiling session."""
+
+    def __init__(
+        self, hass: HomeAssistant, block_threshold: float, detailed: bool
+    ) -> None:
+        """Initialize profiler."""
+        self.hass = hass
+        self.block_threshold = block_threshold
+        self.detailed = detailed
+        self.functions: dict[str, FunctionStats] = {}
+        self.blocking: list[dict[str, Any]] = []
+        self.blocking_count = 0
+        self.stalls: list[dict[str, Any]] = []
+        self.stall_count = 0
+        self._patched: list[tuple[Any, str, Any, bool]] = []
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._cprofile_error: Optional[str] = None
+
+    def _record_hold(self, name: str, hold: float) -> None:
+        """Flag a stretch on the loop above the threshold."""
+        if hold * 1000 < self.block_threshold:
+            return
+        self.blocking_count += 1
+        _LOGGER.warning(
+            "%s held the event loop for %.1f ms (threshold %g ms)",
+            name,
+            hold * 1000,
+            self.block_threshold,
+        )
+        if len(self.blocking) < MAX_BLOCKING_RECORDS:
+            self.blocking.append(
+                {
+                    "time": dt_util.utcnow().isoformat(),
+                    "function": name,
+                    "ms": round(hold * 1000, 1),
+                }
+            )
+
+    def _record_stall(self, lag: float, stack: list[str]) -> None:
+        """Flag a loop stall caught by the lag monitor."""
+        self.stall_count += 1
+        _LOGGER.warning(
+            "Event loop stalled for at least %.1f ms (threshold %g ms), in %s",
+            lag * 1000,
+            self.block_threshold,
+            stack[-1] if stack else "code that finished before its stack was taken",
+        )
+        if len(self.stalls) < MAX_BLOCKING_RECORDS:
+            self.stalls.append(
+                {
+                    "time": dt_util.utcnow().isoformat(),
+                    "ms": round(lag * 1000, 1),
+                    "stack": stack,
+                }
+            )
+
+    def _instrument(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return a timed wrapper for a function or coroutine function."""
+        stats = self.functions.setdefault(name, FunctionStats())
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def _async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                longest_hold = 0.0
+
+                def _on_step(hold: float) -> None:
+                    nonlocal longest_hold
+                    longest_hold = max(longest_hold, hold)
+                    self._record_hold(name, hold)
+
+                start = time.perf_counter()
+                failed = True
+                try:
+                    result = await _HoldTimer(func(*args, **kwargs), _on_step)
+                    failed = False
+                    return result
+                finally:
+                    stats.add(time.perf_counter() - start, longest_hold, failed)
+
+            return _async_wrapper
+
+        @functools.wraps(func)
+        def _wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                duration = time.perf_counter() - start
+                stats.add(duration, duration, failed)
+                self._record_hold(name, duration)
+
+        return _wrapper
+
+    def _patch(self) -> None:
+        """Swap the instrumented wrappers in."""
+        for module_name, class_name, attribute in PROFILE_TARGETS:
+            module = importlib.import_module(f"{__package__}.{module_name}")
+            owner = getattr(module, class_name) if class_name else module
+            name = f"{module_name}.{class_name + '.' if class_name else ''}{attribute}"
+
+            static = inspect.getattr_static(owner, attribute)
+            own = attribute in vars(owner)
+            if isinstance(static, staticmethod):
+                wrapped: Any = staticmethod(self._instrument(name, static.__func__))
+            else:
+                wrapped = self._instrument(name, getattr(owner, attribute))
+            setattr(owner, attribute, wrapped)
+            self._patched.append((owner, attribute, static, own))
+
+    def _unpatch(self) -> None:
+        """Restore the original functions."""
+        for owner, attribute, original, own in reversed(self._patched):
+            if own:
+                setattr(owner, attribute, original)
+            else:
+                delattr(owner, attribute)  # Inherited; drop the override
+        self._patched.clear()
+
+    def _start_cprofile(self) -> None:
+        """Start cProfile on the event loop thread."""
+        self._cprofile = cProfile.Profile()
+        try:
+            self._cprofile.enable()
+        except ValueError as err:
+            # Another profiler (e.g. the Profiler integration) is running
+            self._cprofile = None
+            self._cprofile_error = str(err)
+
+    def _cprofile_report(self) -> str:
+        """Return the integration's rows of the cProfile output."""
+        if self._cprofile is None:
+            return f"not available: {self._cprofile_error}"
+        stream = io.StringIO()
+        stats = pstats.Stats(self._cprofile, stream=stream)
+        # The integration and python-jebao, minus this module's own wrappers
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            r"jebao/(?!profiler\.py)", CPROFILE_ROWS
+        )
+        return stream.getvalue()
+
+    async def async_run(self, duration: float) -> dict[str, Any]:
+        """Profile for the duration, write the report and return a summary."""
+        started = dt_util.now()
+        monitor = _LoopLagMonitor(self.block_threshold / 1000, self._record_stall)
+        self._patch()
+        monitor.start(self.hass)
+        if self.detailed:
+            self._start_cprofile()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            if self._cprofile is not None:
+                self._cprofile.disable()
+            await monitor.async_stop()
+            self._unpatch()
+
+        report = self._report(started, duration)
+        path = Path(
+            self.hass.config.path(
+                f"{DOMAIN}_profile_{started.strftime('%Y%m%d_%H%M%S')}.txt"
+            )
+        )
+        await self.hass.async_add_executor_job(path.write_text, report)
+        _LOGGER.info("Profile report written to %s", path)
+
+        return {
+            "report": str(path),
+            "blocking": self.blocking_count,
+            "loop_stalls": self.stall_count,
+            "functions": {
+                name: asdict(stats)
+                for name, stats in self.functions.items()
+                if stats.calls
+            },
+        }
+
+    def _report(self, started: Any, duration: float) -> str:
+        """Format the report."""
+        lines = [
+            "Jebao integration profile",
+            f"Started: {started.isoformat()}",
+            f"Duration: {duration:g} s",
+            f"Blocking threshold: {self.block_threshold:g} ms",
+            "",
+            f"{'Function':<62} {'calls':>6} {'errors':>6} {'total s':>9} "
+            f"{'mean ms':>9} {'max ms':>9} {'hold ms':>9}",
+        ]
+        for name, stats in sorted(
+            self.functions.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            if not stats.calls:
+                continue
+            lines.append(
+                f"{name:<62} {stats.calls:>6} {stats.errors:>6} {stats.total:>9.3f} "
+                f"{stats.total / stats.calls * 1000:>9.1f} {stats.longest * 1000:>9.1f} "
+                f"{stats.longest_hold * 1000:>9.1f}"
+            )
+        if not any(stats.calls for stats in self.functions.values()):
+            lines.append("(no instrumented calls during the session)")
+
+        lines += ["", f"Event loop held longer than the threshold: {self.blocking_count}"]
+        lines += [
+            f"  {record['time']}  {record['function']}  {record['ms']} ms"
+            for record in self.blocking
+        ]
+        if self.blocking_count > len(self.blocking):
+            lines.append(f"  ... {self.blocking_count - len(self.blocking)} more (see log)")
+
+        lines += ["", f"Event loop stalls, any code (minimum length): {self.stall_count}"]
+        for stall in self.stalls:
+            lines.append(f"  {stall['time']}  {stall['ms']} ms")
+            lines += [f"      {frame}" for frame in stall["stack"]] or [
+                "      (ended before its stack was taken)"
+            ]
+        if self.stall_count > len(self.stalls):
+            lines.append(f"  ... {self.stall_count - len(self.stalls)} more (see log)")
+
+        if self.detailed:
+            lines += ["", "cProfile (event loop thread, jebao functions):", self._cprofile_report()]
+        return "\n".join(lines) + "\n"
+
+
+async def async_profile(
+    hass: HomeAssistant,
+    duration: float = DEFAULT_PROFILE_DURATION,
+    block_threshold: float = DEFAULT_BLOCK_THRESHOLD,
+    detailed: bool = False,
+) -> dict[str, Any]:
+    """Run a profile session (one at a time).
+
+    Raises:
+        HomeAssistantError: A session is already running
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(DATA_PROFILE) is not None:
+        raise HomeAssistantError("A Jebao profile is already running")
+
+    profiler = domain_data[DATA_PROFILE] = JebaoProfiler(hass, block_threshold, detailed)
+    try:
+        return await profiler.async_run(duration)
+    finally:
+        domain_data[DATA_PROFILE] = None
@@ -1,17 +1,29 @@
 """Sensor platform for Jebao."""
 from __future__ import annotations
 
+from datetime import datetime
 import logging
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import CONF_DEVICE_ID, CONF_MODEL, DOMAIN
-from .coordinator import JebaoDataUpdateCoordinator
+from .const import CONF_DEVICE_ID, CONF_MODEL, DOMAIN, MODEL_MD44
+from .coordinator import JebaoDataUpdateCoordinator, JebaoMD44Coordinator
+from .counters import (
+    COUNTER_CYCLES,
+    COUNTER_FEEDS,
+    SPEED_BANDS,
+    JebaoRuntimeCounters,
+)
 from .entity import JebaoEntity
+from .throttle import JebaoThrottle
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,32 +35,45 @@ async def async_setup_entry(
 ) -> None:
     """Set up Jebao sensors from config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    device = data["device"]
     device_id = data["device_id"]
     model = data["model"]
     host = data["host"]
     mac_address = data.get("mac_address")
     firmware_version = data.get("firmware_version")
 
-    # Get or create coordinator
-    if "coordinator" not in data:
-        scan_interval = entry.options.get("scan_interval")
-        if scan_interval:
-            coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id, scan_interval)
-        else:
-            coordinator = JebaoDataUpdateCoordinator(hass, device, entry, device_id)
-        await coordinator.async_config_entry_first_refresh()
-        data["coordinator"] = coordinator
-    else:
-        coordinator = data["coordinator"]
+    throttled = JebaoThrottledSensor(
+        data["coordinator"], data["throttle"], device_id, model, host, mac_address, firmware_version
+    )
+    flaps = JebaoAvailabilityFlapsSensor(
+        data["coordinator"], device_id, model, host, mac_address, firmware_version
+    )
+
+    if model == MODEL_MD44:
+        # The doser's status frame is not decoded yet: diagnostic sensors only
+        async_add_entities([throttled, flaps])
+        return
+
+    coordinator: JebaoDataUpdateCoordinator = data["coordinator"]
+    counters: JebaoRuntimeCounters = data["counters"]
 
     # Create sensors
-    async_add_entities(
-        [
-            JebaoSpeedSensor(coordinator, device_id, model, host, mac_address, firmware_version),
-            JebaoStateSensor(coordinator, device_id, model, host, mac_address, firmware_version),
-        ]
+    entities: list[SensorEntity] = [
+        JebaoSpeedSensor(coordinator, device_id, model, host, mac_address, firmware_version),
+        JebaoStateSensor(coordinator, device_id, model, host, mac_address, firmware_version),
+        JebaoFeedEndSensor(coordinator, device_id, model, host, mac_address, firmware_version),
+        JebaoRuntimeSensor(counters, None, device_id, model, host, mac_address, firmware_version),
+        throttled,
+        flaps,
+    ]
+    entities.extend(
+        JebaoRuntimeSensor(counters, band, device_id, model, host, mac_address, firmware_version)
+        for band, _ in SPEED_BANDS
     )
+    entities.extend(
+        JebaoCounterSensor(counters, counter, device_id, model, host, mac_address, firmware_version)
+        for counter in (COUNTER_CYCLES, COUNTER_FEEDS)
+    )
+    async_add_entities(entities)
 
 
 class JebaoSpeedSensor(JebaoEntity, SensorEntity):
@@ -102,10 +127,215 @@ class JebaoStateSensor(JebaoEntity, SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the current state."""
-        from jebao import DeviceState
-
         state = self.coordinator.data.get("state")
         if state is None:
             return None
 
         return state.name
+
+
+class JebaoFeedEndSensor(JebaoEntity, SensorEntity):
+    """Sensor for when the current feed mode is expected to end.
+
+    Computed locally from the feed start time and configured duration, so it
+    is exact without a short scan interval.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_translation_key = "feed_end"
+
+    def __init__(
+        self,
+        coordinator: JebaoDataUpdateCoordinator,
+        device_id: str,
+        model: str,
+        host: str,
+        mac_address: str | None = None,
+        firmware_version: str | None = None,
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator, device_id, model, host, mac_address, firmware_version)
+        self._attr_unique_id = f"{device_id}_feed_end"
+        self._attr_name = "Feed end"
+        self._attr_icon = "mdi:timer-sand"
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the expected end of feed mode, None when not feeding."""
+        return self.coordinator.feed_ends_at
+
+
+class JebaoRuntimeSensor(JebaoEntity, SensorEntity):
+    """Sensor for cumulative running hours, overall or in one speed band."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 1
+
+    def __init__(
+        self,
+        counters: JebaoRuntimeCounters,
+        band: str | None,
+        device_id: str,
+        model: str,
+        host: str,
+        mac_address: str | None = None,
+        firmware_version: str | None = None,
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(counters.coordinator, device_id, model, host, mac_address, firmware_version)
+        self._counters = counters
+        self._band = band
+        key = f"runtime_{band}" if band else "runtime"
+        self._attr_translation_key = key
+        self._attr_unique_id = f"{device_id}_{key}"
+        self._attr_name = f"Runtime {band} speed" if band else "Runtime"
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def native_value(self) -> float:
+        """Return the cumulative running hours.
+
+        Rounded to a tenth of an hour, so the state (and a recorder row)
+        changes every six minutes of running rather than on every poll.
+        """
+        if self._band:
+            return round(self._counters.band_hours(self._band), 1)
+        return round(self._counters.on_hours, 1)
+
+
+class JebaoCounterSensor(JebaoEntity, SensorEntity):
+    """Sensor for a cumulative event count (on/off cycles, feeds started)."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        counters: JebaoRuntimeCounters,
+        counter: str,
+        device_id: str,
+        model: str,
+        host: str,
+        mac_address: str | None = None,
+        firmware_version: str | None = None,
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(counters.coordinator, device_id, model, host, mac_address, firmware_version)
+        self._counters = counters
+        self._counter = counter
+        self._attr_translation_key = counter
+        self._attr_unique_id = f"{device_id}_{counter}"
+        self._attr_name = "Cycles" if counter == COUNTER_CYCLES else "Feeds"
+        self._attr_icon = "mdi:counter"
+
+    @property
+    def native_value(self) -> int:
+        """Return the count."""
+        return int(self._counters.counters[self._counter])
+
+
+class JebaoThrottledSensor(JebaoEntity, SensorEntity):
+    """Sensor for requests held back by the pump's request budgets.
+
+    The count rises when the pump gets more traffic than its budgets allow;
+    the attributes show how long requests queued.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_translation_key = "throttled_requests"
+
+    def __init__(
+        self,
+        coordinator: JebaoDataUpdateCoordinator | JebaoMD44Coordinator,
+        throttle: JebaoThrottle,
+        device_id: str,
+        model: str,
+        host: str,
+        mac_address: str | None = None,
+        firmware_version: str | None = None,
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator, device_id, model, host, mac_address, firmware_version)
+        self._throttle = throttle
+        self._attr_unique_id = f"{device_id}_throttled_requests"
+        self._attr_name = "Throttled requests"
+        self._attr_icon = "mdi:traffic-light-outline"
+
+    @property
+    def native_value(self) -> int:
+        """Return how many requests have had to wait."""
+        return self._throttle.throttled
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | int]:
+        """Return the queueing per budget.
+
+        Only values that change when a request is throttled; request totals
+        and the live queue length (which change with every poll) are in the
+        diagnostics download.
+        """
+        attrs: dict[str, float | int] = {}
+        for kind, bucket in (("poll", self._throttle.polls), ("command", self._throttle.commands)):
+            stats = bucket.stats
+            attrs[f"{kind}_throttled"] = stats.throttled
+            attrs[f"{kind}_peak_queued"] = stats.peak_queued
+            attrs[f"{kind}_wait_max"] = round(stats.wait_max, 3)
+        return attrs
+
+
+class JebaoAvailabilityFlapsSensor(JebaoEntity, SensorEntity):
+    """Sensor for how often the pump has stopped answering.
+
+    Counts each run of failed polls the last values were kept through
+    (stale) and each outage the entities went unavailable for. It stays
+    available itself so outages remain visible while they happen.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_translation_key = "availability_flaps"
+    _unrecorded_attributes = frozenset({"stale"})
+
+    def __init__(
+        self,
+        coordinator: JebaoDataUpdateCoordinator | JebaoMD44Coordinator,
+        device_id: str,
+        model: str,
+        host: str,
+        mac_address: str | None = None,
+        firmware_version: str | None = None,
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator, device_id, model, host, mac_address, firmware_version)
+        self._attr_unique_id = f"{device_id}_availability_flaps"
+        self._attr_name = "Availability flaps"
+        self._attr_icon = "mdi:lan-pending"
+
+    @property
+    def available(self) -> bool:
+        """Return True; the count is kept locally."""
+        return True
+
+    @property
+    def native_value(self) -> int:
+        """Return how often the pump has been stale or unavailable."""
+        return self.coordinator.availability.flaps
+
+    @property
+    def extra_state_attributes(self) -> dict[str, bool | int]:
+        """Return the availability state and counts.
+
+        Only values that change once per episode, so a run of failed polls
+        doesn't write a state row per poll (the per-poll counts are in the
+        diagnostics download).
+        """
+        availability = self.coordinator.availability
+        stats = availability.stats
+        return {
+            "stale": availability.stale,
+            "stale_episodes": stats.stale_episodes,
+            "outages": stats.outages,
+            "unconfirmed_recoveries": stats.unconfirmed_recoveries,
+        }
@@ -0,0 +1,689 @@
+"""Services for the Jebao integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import voluptuous as vol
+from jebao import JebaoError
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.importlib import async_import_module
+from homeassistant.helpers.service import async_extract_config_entry_ids
+
+from .broker import async_get_broker
+from .burst import async_get_burst_poller
+from .const import (
+    ATTR_ANTIPHASE_PERCENTAGE,
+    ATTR_BLOCK_THRESHOLD,
+    ATTR_DETAILED,
+    ATTR_DURATION,
+    ATTR_ENABLED,
+    ATTR_INTERVAL,
+    ATTR_MODE,
+    ATTR_NAME,
+    ATTR_PERCENTAGE,
+    ATTR_RETRIES,
+    ATTR_SIZE,
+    DATA_PROFILE,
+    DEFAULT_BLOCK_THRESHOLD,
+    DEFAULT_PROFILE_DURATION,
+    DOMAIN,
+    GROUP_MODE_ALTERNATE,
+    GROUP_MODE_SYNC,
+    GROUP_MODES,
+    SERVICE_BURST_POLL,
+    SERVICE_CANCEL_FEED_ALL,
+    SERVICE_FEED_ALL,
+    SERVICE_PROFILE,
+    SERVICE_RESTORE,
+    SERVICE_SET_GROUP,
+    SERVICE_SNAPSHOT,
+    SERVICE_TRACE,
+)
+from .coordinator import JebaoDataUpdateCoordinator
+from .snapshot import (
+    DEFAULT_SNAPSHOT_NAME,
+    MODE_PROGRAM,
+    async_get_snapshots,
+    in_state,
+)
+from .trace import DEFAULT_TRACE_SIZE, async_set_trace
+
+_LOGGER = logging.getLogger(__name__)
+
+# Reconnect timeout for pumps whose session dropped before a group command
+GROUP_CONNECT_TIMEOUT = 5.0
+# Longest a pump waits at the group barrier for the others to get ready
+GROUP_BARRIER_TIMEOUT = 3 * GROUP_CONNECT_TIMEOUT
+
+# Pumps restored from a snapshot at the same time
+RESTORE_CONCURRENCY = 16
+
+# Retries for fleet-wide feed commands (on top of the library's own retries)
+DEFAULT_FEED_RETRIES = 2
+FEED_RETRY_DELAY = 1.0  # seconds, grows linearly per attempt
+
+PERCENTAGE_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=0, max=100))
+
+SET_GROUP_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Required(ATTR_PERCENTAGE): PERCENTAGE_SCHEMA,
+        vol.Optional(ATTR_MODE, default=GROUP_MODE_SYNC): vol.In(GROUP_MODES),
+        vol.Optional(ATTR_ANTIPHASE_PERCENTAGE): PERCENTAGE_SCHEMA,
+    }
+)
+
+RETRIES_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=0, max=5))
+
+FEED_ALL_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10)
+        ),
+        vol.Optional(ATTR_RETRIES, default=DEFAULT_FEED_RETRIES): RETRIES_SCHEMA,
+    }
+)
+
+CANCEL_FEED_ALL_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_RETRIES, default=DEFAULT_FEED_RETRIES): RETRIES_SCHEMA,
+    }
+)
+
+BURST_POLL_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_INTERVAL, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0.5, max=10)
+        ),
+        vol.Optional(ATTR_DURATION, default=120): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=600)
+        ),
+    }
+)
+
+TRACE_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Required(ATTR_ENABLED): cv.boolean,
+        vol.Optional(ATTR_SIZE, default=DEFAULT_TRACE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=50, max=5000)
+        ),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=600)
+        ),
+        vol.Optional(ATTR_BLOCK_THRESHOLD, default=DEFAULT_BLOCK_THRESHOLD): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=1000)
+        ),
+        vol.Optional(ATTR_DETAILED, default=False): cv.boolean,
+    }
+)
+
+SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_NAME, default=DEFAULT_SNAPSHOT_NAME): cv.string,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Jebao services."""
+
+    async def _async_set_group(call: ServiceCall) -> ServiceResponse:
+        return await _async_handle_set_group(hass, call)
+
+    async def _async_feed_all(call: ServiceCall) -> ServiceResponse:
+        return await _async_handle_feed_all(hass, call, start=True)
+
+    async def _async_cancel_feed_all(call: ServiceCall) -> ServiceResponse:
+        return await _async_handle_feed_all(hass, call, start=False)
+
+    async def _async_burst_poll(call: ServiceCall) -> ServiceResponse:
+        return await _async_handle_burst_poll(hass, call)
+
+    async def _async_trace(call: ServiceCall) -> ServiceResponse:
+        return await _async_handle_trace(hass, call)
+
+    async def _async_profile(call: ServiceCall) -> ServiceResponse:
+        return await _async_handle_profile(hass, call)
+
+    async def _async_snapshot(call: ServiceCall) -> ServiceResponse:
+        return await _async_handle_snapshot(hass, call)
+
+    async def _async_restore(call: ServiceCall) -> ServiceResponse:
+        return await _async_handle_restore(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_GROUP,
+        _async_set_group,
+        schema=SET_GROUP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FEED_ALL,
+        _async_feed_all,
+        schema=FEED_ALL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CANCEL_FEED_ALL,
+        _async_cancel_feed_all,
+        schema=CANCEL_FEED_ALL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BURST_POLL,
+        _async_burst_poll,
+        schema=BURST_POLL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_TRACE,
+        _async_trace,
+        schema=TRACE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        _async_snapshot,
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE,
+        _async_restore,
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def _async_get_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[JebaoDataUpdateCoordinator]:
+    """Resolve a service target to the coordinators of loaded pumps.
+
+    An empty target selects every loaded pump. Pumps referenced explicitly by
+    entity come first, in the order given, so pairings in group modes are
+    predictable; the rest are ordered by title.
+    """
+    domain_data: dict[str, Any] = hass.data.get(DOMAIN, {})
+    entry_ids = await async_extract_config_entry_ids(hass, call)
+    if not entry_ids:
+        entry_ids = {
+            entry.entry_id for entry in hass.config_entries.async_entries(DOMAIN)
+        }
+
+    coordinators: list[JebaoDataUpdateCoordinator] = [
+        domain_data[entry_id]["coordinator"]
+        for entry_id in entry_ids
+        if isinstance(domain_data.get(entry_id), dict)
+        # MD-4.4 dosers are read-only and take no pump commands
+        and isinstance(
+            domain_data[entry_id].get("coordinator"), JebaoDataUpdateCoordinator
+        )
+    ]
+
+    explicit_order: list[str] = []
+    entity_ids = call.data.get(ATTR_ENTITY_ID)
+    if isinstance(entity_ids, list):
+        registry = er.async_get(hass)
+        for entity_id in entity_ids:
+            entity = registry.async_get(entity_id)
+            if entity and entity.config_entry_id not in explicit_order:
+                explicit_order.append(entity.config_entry_id)
+
+    def _sort_key(coordinator: JebaoDataUpdateCoordinator) -> tuple[int, str]:
+        entry_id = coordinator.entry.entry_id
+        if entry_id in explicit_order:
+            return explicit_order.index(entry_id), ""
+        return len(explicit_order), coordinator.entry.title
+
+    return sorted(coordinators, key=_sort_key)
+
+
+async def _async_handle_set_group(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Set the speed of many pumps at once, released together."""
+    coordinators = await _async_get_coordinators(hass, call)
+    if not coordinators:
+        return {"pumps": {}}
+
+    percentage: int = call.data[ATTR_PERCENTAGE]
+    mode: str = call.data[ATTR_MODE]
+    antiphase = call.data.get(ATTR_ANTIPHASE_PERCENTAGE, 100 - percentage)
+
+    # Even positions always get the requested speed; odd positions are
+    # switched off (alternate) or run at the counter speed (antiphase).
+    targets: list[int] = []
+    for index in range(len(coordinators)):
+        if mode == GROUP_MODE_SYNC or index % 2 == 0:
+            targets.append(percentage)
+        elif mode == GROUP_MODE_ALTERNATE:
+            targets.append(0)
+        else:
+            targets.append(antiphase)
+
+    barrier = asyncio.Barrier(len(coordinators))
+    results = await asyncio.gather(
+        *(
+            _async_send_synchronized(coordinator, target, barrier)
+            for coordinator, target in zip(coordinators, targets)
+        )
+    )
+
+    # One batched refresh instead of a refresh per command
+    await asyncio.gather(
+        *(coordinator.async_refresh() for coordinator in coordinators)
+    )
+
+    _LOGGER.debug("Group command (%s, %d%%) results: %s", mode, percentage, results)
+    return {
+        "pumps": {
+            coordinator.entry.entry_id: {"title": coordinator.entry.title, **result}
+            for coordinator, result in zip(coordinators, results)
+        }
+    }
+
+
+async def _async_send_synchronized(
+    coordinator: JebaoDataUpdateCoordinator,
+    percentage: int,
+    barrier: asyncio.Barrier,
+) -> dict[str, Any]:
+    """Send one pump's share of a group command once every pump is ready.
+
+    Reconnecting happens before the barrier so session setup on one pump
+    does not delay the others; after release the skew between pumps is
+    just the command round trip. If a pump fails in any other way before
+    the barrier, or the barrier is not released in time, the barrier is
+    broken so no pump waits forever, and the waiting pumps send nothing.
+    """
+    device = coordinator.device
+    connect_error: JebaoError | None = None
+    try:
+        if not device.is_connected:
+            await async_get_broker(coordinator.hass).async_connect(
+                device, timeout=GROUP_CONNECT_TIMEOUT
+            )
+    except JebaoError as err:
+        connect_error = err
+    except BaseException:
+        await barrier.abort()
+        raise
+
+    try:
+        async with asyncio.timeout(GROUP_BARRIER_TIMEOUT):
+            await barrier.wait()
+    except TimeoutError:
+        await barrier.abort()
+        if connect_error is None:
+            return {
+                "success": False,
+                "percentage": percentage,
+                "error": "Timed out waiting for the other pumps of the group",
+            }
+    except asyncio.BrokenBarrierError:
+        if connect_error is None:
+            return {
+                "success": False,
+                "percentage": percentage,
+                "error": "Not sent: another pump of the group failed",
+            }
+    if connect_error is not None:
+        return {"success": False, "percentage": percentage, "error": str(connect_error)}
+
+    start = time.monotonic()
+    try:
+        changed = await coordinator.async_send_percentage(percentage)
+    except (JebaoError, ValueError) as err:
+        _LOGGER.error("Group command failed for %s: %s", coordinator.entry.title, err)
+        return {
+            "success": False,
+            "percentage": percentage,
+            "error": str(err),
+            "latency_ms": round((time.monotonic() - start) * 1000, 1),
+        }
+
+    return {
+        "success": True,
+        "percentage": percentage,
+        "changed": changed,
+        "latency_ms": round((time.monotonic() - start) * 1000, 1),
+    }
+
+
+async def _async_handle_feed_all(
+    hass: HomeAssistant, call: ServiceCall, start: bool
+) -> ServiceResponse:
+    """Start or cancel feed mode on every targeted pump concurrently."""
+    coordinators = await _async_get_coordinators(hass, call)
+    duration: int | None = call.data.get(ATTR_DURATION)
+    retries: int = call.data[ATTR_RETRIES]
+
+    async def _command(coordinator: JebaoDataUpdateCoordinator) -> None:
+        if bool((coordinator.data or {}).get("is_feed_mode")) == start:
+            return  # Already where we want it
+        if not start:
+            await coordinator.async_cancel_feed()
+            return
+        if duration is not None:
+            await coordinator.async_set_feed_duration(duration)
+        await coordinator.async_start_feed()
+
+    errors = await asyncio.gather(
+        *(
+            _async_call_with_retries(coordinator, _command, retries)
+            for coordinator in coordinators
+        )
+    )
+
+    # One batched refresh, then judge compliance from what the pumps report
+    await asyncio.gather(
+        *(coordinator.async_refresh() for coordinator in coordinators)
+    )
+
+    # Keyed by entry_id: titles default to the model and need not be unique
+    complied: dict[str, str] = {}
+    failed: dict[str, dict[str, str]] = {}
+    for coordinator, error in zip(coordinators, errors):
+        entry = coordinator.entry
+        if error is None and not coordinator.last_update_success:
+            error = "unreachable after command"
+        elif error is None and bool(coordinator.data.get("is_feed_mode")) != start:
+            error = "not in feed mode" if start else "still in feed mode"
+        if error is None:
+            complied[entry.entry_id] = entry.title
+        else:
+            failed[entry.entry_id] = {"title": entry.title, "error": error}
+
+    if failed:
+        _LOGGER.warning(
+            "%s did not comply on %d of %d pump(s): %s",
+            SERVICE_FEED_ALL if start else SERVICE_CANCEL_FEED_ALL,
+            len(failed),
+            len(coordinators),
+            ", ".join(f"{result['title']} ({result['error']})" for result in failed.values()),
+        )
+
+    return {"complied": complied, "failed": failed}
+
+
+async def _async_call_with_retries(
+    coordinator: JebaoDataUpdateCoordinator,
+    command: Callable[[JebaoDataUpdateCoordinator], Awaitable[None]],
+    retries: int,
+) -> str | None:
+    """Run a pump command, retrying failures with a linear backoff.
+
+    Returns:
+        None on success, otherwise the last error message
+    """
+    last_error = ""
+    for attempt in range(retries + 1):
+        try:
+            await command(coordinator)
+        except (JebaoError, ValueError) as err:
+            last_error = str(err)
+            _LOGGER.debug(
+                "Command attempt %d/%d failed for %s: %s",
+                attempt + 1,
+                retries + 1,
+                coordinator.entry.title,
+                err,
+            )
+            if attempt < retries:
+                await asyncio.sleep(FEED_RETRY_DELAY * (attempt + 1))
+        else:
+            return None
+    return last_error
+
+
+async def _async_handle_burst_poll(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Poll the targeted pumps fast for a while, then revert.
+
+    Without a requested response the bursts run in the background and the
+    call returns at once; otherwise it waits and reports what was collected.
+    """
+    coordinators = await _async_get_coordinators(hass, call)
+    # All bursts start or none do, so a full budget can't leave some running
+    tasks = async_get_burst_poller(hass).async_start_many(
+        coordinators, call.data[ATTR_INTERVAL], call.data[ATTR_DURATION]
+    )
+    if not call.return_response:
+        return None
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    pumps: dict[str, Any] = {}
+    for coordinator, result in zip(coordinators, results):
+        if isinstance(result, asyncio.CancelledError):
+            # Replaced by a newer burst, or the pump was unloaded
+            result = {"cancelled": True}
+        elif isinstance(result, BaseException):
+            raise result
+        pumps[coordinator.entry.entry_id] = {"title": coordinator.entry.title, **result}
+    return {"pumps": pumps}
+
+
+async def _async_handle_trace(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Turn protocol tracing on or off for the targeted pumps.
+
+    Unlike the pump commands this also covers MD-4.4 dosers. The captured
+    frames are exported through each pump's diagnostics.
+    """
+    domain_data: dict[str, Any] = hass.data.get(DOMAIN, {})
+    entry_ids = await async_extract_config_entry_ids(hass, call)
+    if not entry_ids:
+        entry_ids = {
+            entry.entry_id for entry in hass.config_entries.async_entries(DOMAIN)
+        }
+
+    results: dict[str, Any] = {}
+    for entry_id in entry_ids:
+        data = domain_data.get(entry_id)
+        if not isinstance(data, dict) or "device" not in data:
+            continue  # Not loaded
+        trace = async_set_trace(
+            hass, entry_id, data["device"], call.data[ATTR_ENABLED], call.data[ATTR_SIZE]
+        )
+        entry = hass.config_entries.async_get_entry(entry_id)
+        results[entry_id] = {
+            "title": entry.title if entry else entry_id,
+            "enabled": trace.enabled if trace else False,
+            "frames": len(trace.frames) if trace else 0,
+        }
+        _LOGGER.info(
+            "Protocol trace %s for %s",
+            "started" if call.data[ATTR_ENABLED] else "stopped",
+            entry.title if entry else entry_id,
+        )
+
+    if not call.return_response:
+        return None
+    return {"pumps": results}
+
+
+async def _async_handle_profile(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Profile the integration for a while and write a report.
+
+    Without a requested response the session runs in the background and the
+    call returns at once; otherwise it waits and returns a summary.
+    """
+    if hass.data.get(DOMAIN, {}).get(DATA_PROFILE) is not None:
+        raise HomeAssistantError("A Jebao profile is already running")
+
+    # Only needed while profiling, so kept out of the integration's load
+    profiler = await async_import_module(hass, f"{__package__}.profiler")
+    task = hass.async_create_background_task(
+        profiler.async_profile(
+            hass,
+            call.data[ATTR_DURATION],
+            call.data[ATTR_BLOCK_THRESHOLD],
+            call.data[ATTR_DETAILED],
+        ),
+        f"{DOMAIN} profile",
+    )
+    if not call.return_response:
+        return None
+    return await task
+
+
+async def _async_handle_snapshot(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Save the targeted pumps' current states from coordinator data."""
+    coordinators = await _async_get_coordinators(hass, call)
+    pumps, skipped = await async_get_snapshots(hass).async_take(
+        call.data[ATTR_NAME], coordinators
+    )
+    if skipped:
+        _LOGGER.warning(
+            "Snapshot %r skipped unavailable pump(s): %s",
+            call.data[ATTR_NAME],
+            ", ".join(skipped.values()),
+        )
+    return {
+        "pumps": pumps,
+        "skipped": skipped,
+    }
+
+
+async def _async_handle_restore(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Put pumps back into a snapshot's states, many at a time.
+
+    Pumps already in their snapshot state are left alone. The rest are
+    restored concurrently, then refreshed together and checked.
+    """
+    name: str = call.data[ATTR_NAME]
+    snapshot = await async_get_snapshots(hass).async_get(name)
+    if snapshot is None:
+        raise HomeAssistantError(f"No Jebao snapshot named {name!r}")
+
+    targets: dict[str, Any] = snapshot["pumps"]
+    coordinators = [
+        coordinator
+        for coordinator in await _async_get_coordinators(hass, call)
+        if coordinator.device_id in targets
+    ]
+    semaphore = asyncio.Semaphore(RESTORE_CONCURRENCY)
+
+    async def _restore(coordinator: JebaoDataUpdateCoordinator) -> dict[str, Any]:
+        target = targets[coordinator.device_id]
+        data = coordinator.data if coordinator.last_update_success else None
+        if data and in_state(data, target):
+            return {"result": "unchanged"}
+        if target["mode"] == MODE_PROGRAM:
+            return {
+                "result": "failed",
+                "error": "Program mode cannot be re-entered remotely; "
+                "resume it on the pump",
+            }
+
+        async with semaphore:
+            device = coordinator.device
+            start = time.monotonic()
+            try:
+                if not device.is_connected:
+                    await async_get_broker(hass).async_connect(
+                        device, timeout=GROUP_CONNECT_TIMEOUT
+                    )
+                if device.is_feed_mode:
+                    await coordinator.async_cancel_feed()
+                await coordinator.async_set_desired(
+                    is_on=target["is_on"],
+                    speed=target["speed"] if target["is_on"] else None,
+                    manual_mode=True,
+                )
+            except (JebaoError, ValueError) as err:
+                _LOGGER.error("Restore failed for %s: %s", coordinator.entry.title, err)
+                return {"result": "failed", "error": str(err)}
+            return {
+                "result": "restored",
+                "latency_ms": round((time.monotonic() - start) * 1000, 1),
+            }
+
+    results = await asyncio.gather(
+        *(_restore(coordinator) for coordinator in coordinators)
+    )
+
+    # One batched refresh for the pumps that were sent commands
+    restored = [
+        coordinator
+        for coordinator, result in zip(coordinators, results)
+        if result["result"] == "restored"
+    ]
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in restored))
+    for coordinator, result in zip(coordinators, results):
+        if coordinator in restored and not (
+            coordinator.last_update_success
+            and in_state(coordinator.data, targets[coordinator.device_id])
+        ):
+            result["result"] = "failed"
+            result["error"] = "not in snapshot state after restore"
+
+    # Keyed by device_id, like the snapshot itself
+    pumps: dict[str, Any] = {
+        coordinator.device_id: {"title": coordinator.entry.title, **result}
+        for coordinator, result in zip(coordinators, results)
+    }
+    if not any(str(field) in call.data for field in cv.ENTITY_SERVICE_FIELDS):
+        # Whole-snapshot restore: mention pumps that are not loaded
+        for device_id, target in targets.items():
+            if device_id not in pumps:
+                pumps[device_id] = {
+                    "title": target["title"],
+                    "result": "failed",
+                    "error": "not loaded",
+                }
+
+    failed = [
+        result["title"] for result in pumps.values() if result["result"] == "failed"
+    ]
+    if failed:
+        _LOGGER.warning("Restore of snapshot %r failed for: %s", name, ", ".join(failed))
+    return {"pumps": pumps}
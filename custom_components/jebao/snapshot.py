@@ -0,0 +1,109 @@
+"""Named fleet snapshots for Jebao pumps.
+
+A snapshot records each pump's on/off state, speed and mode from the
+coordinators' latest data (no pump I/O) so it can be restored after
+maintenance. Snapshots are saved to storage, so a restart in the middle of
+a maintenance window does not lose them.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_SNAPSHOTS, DOMAIN
+from .coordinator import JebaoDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+
+DEFAULT_SNAPSHOT_NAME = "default"
+
+MODE_MANUAL = "manual"
+MODE_PROGRAM = "program"
+
+
+def pump_state(data: dict[str, Any]) -> dict[str, Any]:
+    """Return the restorable state in a coordinator snapshot."""
+    return {
+        "is_on": bool(data["is_on"]),
+        "speed": data["speed"],
+        "mode": MODE_PROGRAM if data["is_program_mode"] else MODE_MANUAL,
+    }
+
+
+def in_state(data: dict[str, Any], target: dict[str, Any]) -> bool:
+    """Return True if a pump already is in a snapshot state.
+
+    Feed mode is a temporary pause, so a feeding pump never matches.
+    """
+    if data.get("is_feed_mode"):
+        return False
+    current = pump_state(data)
+    if current["mode"] != target["mode"]:
+        return False
+    if target["mode"] == MODE_PROGRAM:
+        return True  # The pump's own schedule sets on/off and speed
+    if current["is_on"] != target["is_on"]:
+        return False
+    return not target["is_on"] or current["speed"] == target["speed"]
+
+
+class JebaoSnapshots:
+    """Persisted, named snapshots of pump states."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize snapshots."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._snapshots: Optional[dict[str, Any]] = None
+
+    async def _async_load(self) -> dict[str, Any]:
+        """Return the stored snapshots, loading them on first use."""
+        if self._snapshots is None:
+            stored = await self._store.async_load()
+            self._snapshots = (stored or {}).get("snapshots", {})
+        return self._snapshots
+
+    async def async_take(
+        self, name: str, coordinators: list[JebaoDataUpdateCoordinator]
+    ) -> tuple[dict[str, Any], dict[str, str]]:
+        """Record the pumps' current states under a name.
+
+        Returns:
+            The recorded pump states by device_id, and the titles (by
+            device_id) of pumps skipped because they have no current data
+        """
+        pumps: dict[str, Any] = {}
+        skipped: dict[str, str] = {}
+        for coordinator in coordinators:
+            if not coordinator.last_update_success or not coordinator.data:
+                skipped[coordinator.device_id] = coordinator.entry.title
+                continue
+            pumps[coordinator.device_id] = {
+                "title": coordinator.entry.title,
+                **pump_state(coordinator.data),
+            }
+
+        snapshots = await self._async_load()
+        snapshots[name] = {"created": dt_util.utcnow().isoformat(), "pumps": pumps}
+        await self._store.async_save({"snapshots": snapshots})
+        _LOGGER.info("Saved snapshot %r of %d pump(s)", name, len(pumps))
+        return pumps, skipped
+
+    async def async_get(self, name: str) -> Optional[dict[str, Any]]:
+        """Return a snapshot by name."""
+        return (await self._async_load()).get(name)
+
+
+@callback
+def async_get_snapshots(hass: HomeAssistant) -> JebaoSnapshots:
+    """Return the domain-wide snapshots, creating them on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SNAPSHOTS not in domain_data:
+        domain_data[DATA_SNAPSHOTS] = JebaoSnapshots(hass)
+    return domain_data[DATA_SNAPSHOTS]
@@ -0,0 +1,255 @@
+"""Long-term statistics for Jebao pumps.
+
+Hourly speed, on-time and feed-count aggregates are built incrementally from
+coordinator snapshots and published as external statistics, so speed and
+runtime history is available without the recorder storing (and later
+scanning) every state change of the pump sensors.
+
+Published statistics, per pump:
+- ``jebao:<device_id>_speed``: time-weighted mean/min/max speed while running
+- ``jebao:<device_id>_on_time``: hours running (cumulative sum)
+- ``jebao:<device_id>_feeds``: feed modes started (cumulative sum)
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Optional
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import PERCENTAGE, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, MAX_SAMPLE_GAP
+from .coordinator import JebaoDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+
+
+class _HourAggregate:
+    """Running aggregates for one clock hour."""
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize aggregate."""
+        self.start = start
+        self.observed = 0.0  # seconds with a known pump state
+        self.on_seconds = 0.0
+        self.speed_seconds = 0.0  # integral of speed over on-time
+        self.speed_min: Optional[float] = None
+        self.speed_max: Optional[float] = None
+        self.feeds = 0
+
+    def add(self, seconds: float, is_on: bool, speed: Optional[int]) -> None:
+        """Credit a span during which the pump held one state."""
+        self.observed += seconds
+        if not is_on or speed is None:
+            return
+        self.on_seconds += seconds
+        self.speed_seconds += speed * seconds
+        self.speed_min = speed if self.speed_min is None else min(self.speed_min, speed)
+        self.speed_max = speed if self.speed_max is None else max(self.speed_max, speed)
+
+
+class JebaoStatistics:
+    """Aggregate one pump's snapshots into hourly long-term statistics."""
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: JebaoDataUpdateCoordinator
+    ) -> None:
+        """Initialize statistics."""
+        self.hass = hass
+        self.coordinator = coordinator
+        object_id = slugify(coordinator.device_id or coordinator.entry.entry_id)
+        self._speed_id = f"{DOMAIN}:{object_id}_speed"
+        self._on_time_id = f"{DOMAIN}:{object_id}_on_time"
+        self._feeds_id = f"{DOMAIN}:{object_id}_feeds"
+
+        self._hour: Optional[_HourAggregate] = None
+        self._last_sample: Optional[datetime] = None
+        self._last_data: Optional[dict[str, Any]] = None
+        self._on_time_sum = 0.0
+        self._feeds_sum = 0.0
+        self._last_published: Optional[float] = None  # start_ts of newest row
+
+    async def async_start(self) -> None:
+        """Continue the cumulative sums from what the recorder already has.
+
+        If the newest rows are the current hour, flushed when the pump was
+        last unloaded, that hour is picked up again and replaced once it is
+        complete.
+        """
+        recorder = get_instance(self.hass)
+        # A reload's flush may still be queued with the recorder
+        await recorder.async_block_till_done()
+        current = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        resume = _HourAggregate(current)
+        resumed = False
+        for statistic_id in (self._on_time_id, self._feeds_id):
+            last = await self._async_last_row(statistic_id, {"state", "sum"})
+            if last is None:
+                continue
+            total, state = last.get("sum") or 0.0, last.get("state") or 0.0
+            if last["start"] == current.timestamp():
+                # Resumed below; the sums go back to before this hour
+                total -= state
+                resumed = True
+                if statistic_id == self._on_time_id:
+                    resume.on_seconds = resume.observed = state * 3600
+                else:
+                    resume.feeds = int(state)
+            else:
+                self._last_published = max(self._last_published or 0.0, last["start"])
+            if statistic_id == self._on_time_id:
+                self._on_time_sum = total
+            else:
+                self._feeds_sum = total
+
+        if not resumed:
+            return
+        speed = await self._async_last_row(self._speed_id, {"mean", "min", "max"})
+        if speed is not None and speed["start"] == current.timestamp():
+            resume.speed_seconds = (speed.get("mean") or 0.0) * resume.on_seconds
+            resume.speed_min = speed.get("min")
+            resume.speed_max = speed.get("max")
+        self._hour = resume
+
+    async def _async_last_row(
+        self, statistic_id: str, types: set[Any]
+    ) -> Optional[dict[str, Any]]:
+        """Return the newest row of one statistic, if any."""
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, types
+        )
+        return last[statistic_id][0] if last else None
+
+    @callback
+    def async_flush(self, *_: Any) -> None:
+        """Publish the hour in progress, so an unload or restart does not lose it."""
+        self._accumulate(dt_util.utcnow())
+        if self._hour is not None:
+            self._publish(self._hour)
+            self._hour = None
+        self._last_sample = None
+
+    @callback
+    def async_update(self) -> None:
+        """Take a sample from the coordinator (coordinator listener)."""
+        now = dt_util.utcnow()
+        self._accumulate(now)
+
+        data = self.coordinator.fresh_data
+        if not data:
+            self._last_sample = None
+            self._last_data = None
+            return
+
+        if data.get("is_feed_mode") and not (
+            self._last_data and self._last_data.get("is_feed_mode")
+        ):
+            self._hour_for(now).feeds += 1
+
+        self._last_sample = now
+        self._last_data = data
+
+    def _hour_for(self, when: datetime) -> _HourAggregate:
+        """Return the aggregate for the hour containing a timestamp."""
+        start = when.replace(minute=0, second=0, microsecond=0)
+        if self._hour is None or self._hour.start != start:
+            self._hour = _HourAggregate(start)
+        return self._hour
+
+    def _accumulate(self, now: datetime) -> None:
+        """Credit the previous sample's state up to now, closing any finished hours."""
+        last, data = self._last_sample, self._last_data
+        if last is None or data is None or now - last > MAX_SAMPLE_GAP:
+            if self._hour is not None and now - self._hour.start >= HOUR:
+                self._publish(self._hour)
+                self._hour = None
+            return
+
+        while last < now:
+            hour = self._hour_for(last)
+            end = min(now, hour.start + HOUR)
+            hour.add((end - last).total_seconds(), data["is_on"], data.get("speed"))
+            if end == hour.start + HOUR:
+                self._publish(hour)
+            last = end
+
+    def _publish(self, hour: _HourAggregate) -> None:
+        """Publish a completed hour."""
+        start_ts = hour.start.timestamp()
+        if (hour.observed <= 0 and not hour.feeds) or (
+            self._last_published is not None and start_ts <= self._last_published
+        ):
+            return
+        self._last_published = start_ts
+
+        on_hours = hour.on_seconds / 3600
+        self._on_time_sum += on_hours
+        self._feeds_sum += hour.feeds
+        title = self.coordinator.entry.title
+
+        if hour.on_seconds > 0:
+            self._add(
+                self._speed_id,
+                f"{title} speed",
+                PERCENTAGE,
+                StatisticData(
+                    start=hour.start,
+                    mean=hour.speed_seconds / hour.on_seconds,
+                    min=hour.speed_min,
+                    max=hour.speed_max,
+                ),
+                has_mean=True,
+            )
+        self._add(
+            self._on_time_id,
+            f"{title} on time",
+            UnitOfTime.HOURS,
+            StatisticData(start=hour.start, state=on_hours, sum=self._on_time_sum),
+            has_mean=False,
+        )
+        self._add(
+            self._feeds_id,
+            f"{title} feeds",
+            None,
+            StatisticData(start=hour.start, state=hour.feeds, sum=self._feeds_sum),
+            has_mean=False,
+        )
+        _LOGGER.debug(
+            "Published statistics for %s, hour %s: %.2fh on, %d feed(s)",
+            title,
+            hour.start,
+            on_hours,
+            hour.feeds,
+        )
+
+    def _add(
+        self,
+        statistic_id: str,
+        name: str,
+        unit: Optional[str],
+        row: StatisticData,
+        has_mean: bool,
+    ) -> None:
+        """Queue one hourly row with the recorder."""
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                has_mean=has_mean,
+                has_sum=not has_mean,
+                name=name,
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=unit,
+            ),
+            [row],
+        )
@@ -0,0 +1,145 @@
+"""Live telemetry for Jebao pumps.
+
+Every coordinator snapshot is turned into a small sample (state, speed and
+poll round trip) and kept in a per-pump ring buffer in memory. Websocket
+subscribers get the buffered history followed by new samples as they
+arrive; nothing here goes through the recorder. While at least one
+subscriber is watching a pump, that pump is polled at the telemetry
+interval instead of its configured scan interval.
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from datetime import timedelta
+from functools import partial
+import logging
+from typing import Any, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_TELEMETRY, DOMAIN
+from .coordinator import JebaoDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Poll interval while a pump has a live subscriber
+TELEMETRY_INTERVAL = timedelta(seconds=3)
+# Samples kept per pump (10 minutes at the telemetry interval)
+TELEMETRY_HISTORY = 200
+
+POLL_OVERRIDE_KEY = "telemetry"
+
+SampleCallback = Callable[[list[dict[str, Any]]], None]
+
+
+class JebaoTelemetry:
+    """Fan coordinator snapshots out to live subscribers."""
+
+    def __init__(self) -> None:
+        """Initialize telemetry."""
+        self._coordinators: dict[str, JebaoDataUpdateCoordinator] = {}
+        self._history: dict[str, deque[dict[str, Any]]] = {}
+        self._subscribers: dict[int, tuple[SampleCallback, Optional[set[str]]]] = {}
+        self._next_id = 0
+
+    @callback
+    def async_add_coordinator(
+        self, coordinator: JebaoDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Start sampling a pump; returns a callback that stops it."""
+        entry_id = coordinator.entry.entry_id
+        self._coordinators[entry_id] = coordinator
+        self._history[entry_id] = deque(maxlen=TELEMETRY_HISTORY)
+        unsub = coordinator.async_add_listener(
+            partial(self._async_sample, coordinator)
+        )
+        self._async_update_poll_overrides()
+
+        @callback
+        def _async_remove() -> None:
+            unsub()
+            coordinator.async_set_poll_override(POLL_OVERRIDE_KEY, None)
+            self._coordinators.pop(entry_id, None)
+            self._history.pop(entry_id, None)
+
+        return _async_remove
+
+    @callback
+    def async_subscribe(
+        self, send: SampleCallback, entry_ids: Optional[set[str]] = None
+    ) -> CALLBACK_TYPE:
+        """Subscribe to new samples for some (default: all) pumps."""
+        subscriber_id = self._next_id
+        self._next_id += 1
+        self._subscribers[subscriber_id] = (send, entry_ids)
+        self._async_update_poll_overrides()
+
+        @callback
+        def _async_unsubscribe() -> None:
+            self._subscribers.pop(subscriber_id, None)
+            self._async_update_poll_overrides()
+
+        return _async_unsubscribe
+
+    @callback
+    def async_history(
+        self, entry_ids: Optional[set[str]] = None
+    ) -> list[dict[str, Any]]:
+        """Return buffered samples, oldest first."""
+        samples = [
+            sample
+            for entry_id, history in self._history.items()
+            if entry_ids is None or entry_id in entry_ids
+            for sample in history
+        ]
+        samples.sort(key=lambda sample: sample["time"])
+        return samples
+
+    @callback
+    def _async_update_poll_overrides(self) -> None:
+        """Poll fast exactly the pumps that have a subscriber."""
+        for entry_id, coordinator in self._coordinators.items():
+            watched = any(
+                entry_ids is None or entry_id in entry_ids
+                for _, entry_ids in self._subscribers.values()
+            )
+            coordinator.async_set_poll_override(
+                POLL_OVERRIDE_KEY, TELEMETRY_INTERVAL if watched else None
+            )
+
+    @callback
+    def _async_sample(self, coordinator: JebaoDataUpdateCoordinator) -> None:
+        """Record a snapshot and forward it to subscribers (coordinator listener)."""
+        entry_id = coordinator.entry.entry_id
+        data = coordinator.data or {}
+        state = data.get("state")
+        poll = coordinator.last_poll_duration
+        sample: dict[str, Any] = {
+            "entry_id": entry_id,
+            "title": coordinator.entry.title,
+            "time": dt_util.utcnow().isoformat(),
+            "available": coordinator.last_update_success,
+            "stale": coordinator.availability.stale,
+            "is_on": data.get("is_on"),
+            "speed": data.get("speed"),
+            "state": state.name if state is not None else None,
+            "is_feed_mode": data.get("is_feed_mode"),
+            "poll_ms": round(poll * 1000, 1) if poll is not None else None,
+        }
+        if entry_id in self._history:
+            self._history[entry_id].append(sample)
+
+        for send, entry_ids in list(self._subscribers.values()):
+            if entry_ids is None or entry_id in entry_ids:
+                send([sample])
+
+
+@callback
+def async_get_telemetry(hass: HomeAssistant) -> JebaoTelemetry:
+    """Return the domain-wide telemetry hub, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_TELEMETRY not in domain_data:
+        domain_data[DATA_TELEMETRY] = JebaoTelemetry()
+    return domain_data[DATA_TELEMETRY]
@@ -0,0 +1,198 @@
+"""Per-pump traffic shaping for Jebao pumps.
+
+Every request a pump session sends goes through one of two token buckets,
+one for status reads (polls) and one for control commands, so automations,
+scenes, the fan slider, bursts and the coordinator hitting one pump at the
+same time are spaced out instead of piling onto the pump's firmware. The
+buckets sit in front of python-jebao's request calls, so the library's own
+retries and the status reads inside its commands are counted as well.
+
+A request waits in FIFO order for a token before its own timeout starts,
+so overload shows up as measured queueing (in diagnostics and on the
+throttled-requests sensor) rather than as request timeouts.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+import logging
+import time
+from typing import Any, Optional
+
+from jebao import JebaoDevice
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+
+from .const import (
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_RATE,
+    CONF_POLL_BURST,
+    CONF_POLL_RATE,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_POLL_BURST,
+    DEFAULT_POLL_RATE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Queue waits longer than this are logged
+SLOW_QUEUE_WAIT = 5.0  # seconds
+
+# Seconds the current task's requests have waited for tokens, so the
+# latency policy can leave the queueing out of its round-trip samples
+QUEUE_WAIT: ContextVar[float] = ContextVar("jebao_queue_wait", default=0.0)
+
+
+@dataclass
+class BucketStats:
+    """Queueing seen by one token bucket."""
+
+    acquired: int = 0
+    # Requests that had to wait for a token (or behind one that did)
+    throttled: int = 0
+    queued: int = 0
+    peak_queued: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+
+class TokenBucket:
+    """Token bucket with a FIFO queue of waiting requests."""
+
+    def __init__(self, name: str, rate: float, burst: int) -> None:
+        """Initialize bucket.
+
+        Args:
+            name: Label for logs and diagnostics
+            rate: Tokens added per second
+            burst: Bucket size (requests allowed back to back)
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.stats = BucketStats()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()  # asyncio locks are FIFO
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def async_acquire(self) -> float:
+        """Wait for a token and take it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        stats = self.stats
+        start = time.monotonic()
+        delayed = self._lock.locked()
+        stats.queued += 1
+        stats.peak_queued = max(stats.peak_queued, stats.queued)
+        try:
+            async with self._lock:
+                self._refill()
+                while self._tokens < 1:
+                    delayed = True
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            stats.queued -= 1
+
+        waited = time.monotonic() - start
+        stats.acquired += 1
+        if delayed:
+            stats.throttled += 1
+            stats.wait_total += waited
+            stats.wait_max = max(stats.wait_max, waited)
+            if waited >= SLOW_QUEUE_WAIT:
+                _LOGGER.warning(
+                    "%s request waited %.1f s for the pump's budget (%d still queued)",
+                    self.name,
+                    waited,
+                    stats.queued,
+                )
+        return waited
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the configuration and metrics for diagnostics."""
+        stats = self.stats
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            **asdict(stats),
+            "wait_mean": stats.wait_total / stats.throttled if stats.throttled else 0.0,
+        }
+
+
+class JebaoThrottle:
+    """Poll and command budgets for one pump's session."""
+
+    def __init__(
+        self,
+        poll_rate: float = DEFAULT_POLL_RATE,
+        poll_burst: int = DEFAULT_POLL_BURST,
+        command_rate: float = DEFAULT_COMMAND_RATE,
+        command_burst: int = DEFAULT_COMMAND_BURST,
+    ) -> None:
+        """Initialize throttle."""
+        self.polls = TokenBucket("Status", poll_rate, poll_burst)
+        self.commands = TokenBucket("Command", command_rate, command_burst)
+        self._device: Optional[JebaoDevice] = None
+
+    @classmethod
+    def from_entry(cls, entry: ConfigEntry) -> JebaoThrottle:
+        """Create a throttle with the budgets in an entry's options."""
+        return cls(
+            entry.options.get(CONF_POLL_RATE, DEFAULT_POLL_RATE),
+            entry.options.get(CONF_POLL_BURST, DEFAULT_POLL_BURST),
+            entry.options.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE),
+            entry.options.get(CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST),
+        )
+
+    @property
+    def throttled(self) -> int:
+        """Return how many requests have had to wait."""
+        return self.polls.stats.throttled + self.commands.stats.throttled
+
+    @callback
+    def async_attach(self, device: JebaoDevice) -> None:
+        """Put the budgets in front of a device's requests."""
+        self.async_detach()
+        protocol = device._protocol  # noqa: SLF001
+        request_status = protocol.request_status
+        send_control_command = protocol.send_control_command
+
+        async def _throttled_request_status(*args: Any, **kwargs: Any) -> bytes:
+            QUEUE_WAIT.set(QUEUE_WAIT.get() + await self.polls.async_acquire())
+            return await request_status(*args, **kwargs)
+
+        async def _throttled_send_control_command(*args: Any, **kwargs: Any) -> None:
+            QUEUE_WAIT.set(QUEUE_WAIT.get() + await self.commands.async_acquire())
+            await send_control_command(*args, **kwargs)
+
+        # Instance attributes shadow the protocol's methods until detached
+        protocol.request_status = _throttled_request_status
+        protocol.send_control_command = _throttled_send_control_command
+        self._device = device
+
+    @callback
+    def async_detach(self) -> None:
+        """Remove the budgets from the device."""
+        if self._device is None:
+            return
+        protocol = self._device._protocol  # noqa: SLF001
+        protocol.__dict__.pop("request_status", None)
+        protocol.__dict__.pop("send_control_command", None)
+        self._device = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return both budgets for diagnostics."""
+        return {"polls": self.polls.as_dict(), "commands": self.commands.as_dict()}
@@ -0,0 +1,160 @@
+"""Protocol traces for Jebao pumps.
+
+An opt-in, bounded ring buffer of every frame a pump session sends and
+receives, with timestamps, so misbehaviour under load can be inspected
+from a diagnostics download and replayed offline (scripts/replay_trace.py).
+Tracing wraps the session's raw send and read calls; nothing is recorded
+and nothing is wrapped while it is off.
+"""
+from __future__ import annotations
+
+from collections import deque
+import logging
+import time
+from typing import Any, Optional
+
+from jebao import JebaoDevice
+from jebao.const import MSG_LOGIN_REQUEST, MSG_PASSCODE_RESPONSE
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_TRACE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Frames kept per pump unless the service asks for another size
+DEFAULT_TRACE_SIZE = 500
+
+# Login frames carry the pump's local passcode in these bytes
+PASSCODE_SLICE = slice(10, 20)
+
+FRAME_TX = "tx"
+FRAME_RX = "rx"
+FRAME_RX_ERROR = "rx_error"
+
+
+def _redact(data: bytes) -> tuple[bytes, bool]:
+    """Blank out the passcode in login frames."""
+    if len(data) > 7 and data[7] in (MSG_PASSCODE_RESPONSE, MSG_LOGIN_REQUEST):
+        redacted = bytearray(data)
+        length = len(redacted[PASSCODE_SLICE])
+        redacted[PASSCODE_SLICE] = bytes(length)
+        return bytes(redacted), True
+    return data, False
+
+
+class JebaoProtocolTrace:
+    """Ring buffer of the frames exchanged with one pump."""
+
+    def __init__(self, size: int = DEFAULT_TRACE_SIZE) -> None:
+        """Initialize trace."""
+        self.frames: deque[dict[str, Any]] = deque(maxlen=size)
+        self.recorded = 0
+        self.started_at = dt_util.utcnow()
+        self._start = time.monotonic()
+        self._device: Optional[JebaoDevice] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Return True while frames are being recorded."""
+        return self._device is not None
+
+    @callback
+    def async_attach(self, device: JebaoDevice) -> None:
+        """Start recording a device's session (replacing any earlier one)."""
+        self.async_detach()
+        protocol = device._protocol  # noqa: SLF001
+        send_raw = protocol._send_raw  # noqa: SLF001
+        read_raw = protocol._read_raw  # noqa: SLF001
+
+        async def _traced_send_raw(data: bytes) -> None:
+            self._record(FRAME_TX, data)
+            await send_raw(data)
+
+        async def _traced_read_raw() -> bytes:
+            try:
+                data = await read_raw()
+            except BaseException as err:
+                # Includes cancellation by a request timeout
+                self._record(FRAME_RX_ERROR, error=type(err).__name__)
+                raise
+            self._record(FRAME_RX, data)
+            return data
+
+        # Instance attributes shadow the protocol's methods until detached
+        protocol._send_raw = _traced_send_raw  # noqa: SLF001
+        protocol._read_raw = _traced_read_raw  # noqa: SLF001
+        self._device = device
+        _LOGGER.debug("Protocol trace started for %s", device.host)
+
+    @callback
+    def async_detach(self) -> None:
+        """Stop recording; the frames already captured are kept."""
+        if self._device is None:
+            return
+        protocol = self._device._protocol  # noqa: SLF001
+        protocol.__dict__.pop("_send_raw", None)
+        protocol.__dict__.pop("_read_raw", None)
+        _LOGGER.debug("Protocol trace stopped for %s", self._device.host)
+        self._device = None
+
+    def _record(
+        self, direction: str, data: bytes = b"", error: Optional[str] = None
+    ) -> None:
+        """Append one frame to the ring buffer."""
+        frame: dict[str, Any] = {
+            "t": round(time.monotonic() - self._start, 6),
+            "dir": direction,
+        }
+        if error is not None:
+            frame["error"] = error
+        else:
+            data, redacted = _redact(data)
+            frame["data"] = data.hex()
+            if redacted:
+                frame["redacted"] = True
+        self.frames.append(frame)
+        self.recorded += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace for diagnostics (and the replay script)."""
+        return {
+            "enabled": self.enabled,
+            "size": self.frames.maxlen,
+            "started_at": self.started_at.isoformat(),
+            "recorded": self.recorded,
+            "dropped": self.recorded - len(self.frames),
+            "frames": list(self.frames),
+        }
+
+
+@callback
+def async_get_traces(hass: HomeAssistant) -> dict[str, JebaoProtocolTrace]:
+    """Return the traces by config entry ID (kept across entry reloads)."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_TRACE, {})
+
+
+@callback
+def async_set_trace(
+    hass: HomeAssistant,
+    entry_id: str,
+    device: JebaoDevice,
+    enabled: bool,
+    size: int = DEFAULT_TRACE_SIZE,
+) -> Optional[JebaoProtocolTrace]:
+    """Turn tracing of an entry's session on or off.
+
+    Turning it on starts a fresh buffer; turning it off keeps the captured
+    frames available to diagnostics.
+    """
+    traces = async_get_traces(hass)
+    trace = traces.get(entry_id)
+    if trace is not None:
+        trace.async_detach()
+    if not enabled:
+        return trace
+
+    trace = traces[entry_id] = JebaoProtocolTrace(size)
+    trace.async_attach(device)
+    return trace
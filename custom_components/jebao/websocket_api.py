@@ -0,0 +1,52 @@
+"""Websocket API for Jebao live telemetry."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .telemetry import async_get_telemetry
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the Jebao websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "jebao/subscribe",
+        vol.Optional("entry_ids"): [str],
+        vol.Optional("history", default=True): bool,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream pump samples, starting with the buffered history.
+
+    Events carry ``{"samples": [...]}``. Pumps in ``entry_ids`` (default:
+    all) are polled fast until the subscription ends.
+    """
+    telemetry = async_get_telemetry(hass)
+    entry_ids = set(msg["entry_ids"]) if "entry_ids" in msg else None
+
+    @callback
+    def _async_send(samples: list[dict[str, Any]]) -> None:
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"samples": samples})
+        )
+
+    connection.subscriptions[msg["id"]] = telemetry.async_subscribe(
+        _async_send, entry_ids
+    )
+    connection.send_result(msg["id"])
+    if msg["history"]:
+        _async_send(telemetry.async_history(entry_ids))
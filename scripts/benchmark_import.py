@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Measure how long the Jebao integration takes to import and load.
+
+Usage:
+    python scripts/benchmark_import.py [--runs 21] [--budget MS] [--top 15]
+
+Each run starts a fresh interpreter, imports what Home Assistant already
+has loaded by the time it sets up this integration, and then times the
+two steps bootstrap pays for:
+
+- component: the integration package plus the platforms Home Assistant
+  preloads with it (config_flow, diagnostics)
+- platforms: the five entity platforms, imported when the entry is set up
+
+The fastest run is reported against the measured baseline from before the
+import trimming (scheduling noise only ever adds time, so the best run is
+the stable figure; the median is shown too). The slowest modules first
+imported by the integration (its own and any dependencies it drags in) are
+listed from ``-X importtime``.
+
+Between invocations the best run still moves by about 1 ms on a shared
+host, as much as the trimming saved, so there is no default pass/fail
+budget. Pass ``--budget`` to exit with status 1 above a figure measured on
+your own machine.
+
+Needs Home Assistant and python-jebao installed; run from the repository
+root.
+"""
+from __future__ import annotations
+
+import argparse
+import compileall
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+# Best-run milliseconds for component + platforms before the import
+# trimming (Python 3.13 / Home Assistant 2025.2, best of 21 runs, taken over
+# five invocations; 14.2 ms after it)
+BASELINE_MS = 15.5
+
+PACKAGE = "custom_components.jebao"
+PRELOADED_PLATFORMS = ("config_flow", "diagnostics")
+ENTITY_PLATFORMS = ("binary_sensor", "button", "fan", "number", "sensor")
+
+# Loaded by Home Assistant before it sets up the integration (core, the
+# helpers every integration uses, default_config's diagnostics and dhcp,
+# the entity components and the recorder, which is an after_dependency)
+BASELINE_MODULES = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.selector",
+    "homeassistant.helpers.service_info.dhcp",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.button",
+    "homeassistant.components.diagnostics",
+    "homeassistant.components.fan",
+    "homeassistant.components.number",
+    "homeassistant.components.sensor",
+    "homeassistant.components.recorder",
+    "homeassistant.components.websocket_api",
+)
+
+IMPORTTIME_PREFIX = "import time:"
+
+# __import__ rather than importlib.import_module, which -X importtime misses
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+for name in {baseline!r}:
+    __import__(name)
+print("--measure--", file=sys.stderr, flush=True)
+timings = {{}}
+start = time.perf_counter()
+for name in {component!r}:
+    __import__(name)
+timings["component"] = time.perf_counter() - start
+start = time.perf_counter()
+for name in {platforms!r}:
+    __import__(name)
+timings["platforms"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def _run_once(root: Path) -> tuple[dict[str, float], dict[str, int]]:
+    """Time one cold import; return step timings and per-module self µs."""
+    code = CHILD.format(
+        root=str(root),
+        baseline=BASELINE_MODULES,
+        component=(PACKAGE, *(f"{PACKAGE}.{p}" for p in PRELOADED_PLATFORMS)),
+        platforms=tuple(f"{PACKAGE}.{p}" for p in ENTITY_PLATFORMS),
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        raise SystemExit(result.stderr.strip().splitlines()[-1])
+
+    # Only modules imported after the baseline count against the budget
+    self_us: dict[str, int] = {}
+    measuring = False
+    for line in result.stderr.splitlines():
+        if line == "--measure--":
+            measuring = True
+        elif measuring and line.startswith(IMPORTTIME_PREFIX):
+            # "import time: <self us> | <cumulative us> | <module>"
+            own, _, name = line[len(IMPORTTIME_PREFIX) :].split("|")
+            self_us[name.strip()] = int(own)
+    return json.loads(result.stdout), self_us
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=21, help="fresh interpreters to time")
+    parser.add_argument(
+        "--budget", type=float, help="exit with status 1 when the best run is over this (ms)"
+    )
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    # Home Assistant imports from bytecode caches; time that, not compiling
+    compileall.compile_dir(root / PACKAGE.replace(".", "/"), quiet=1)
+    _run_once(root)  # Warm-up: OS file cache
+
+    totals: dict[str, list[float]] = {"component": [], "platforms": []}
+    modules: dict[str, list[int]] = {}
+    for _ in range(args.runs):
+        timings, self_us = _run_once(root)
+        for step, seconds in timings.items():
+            totals[step].append(seconds * 1000)
+        for name, micros in self_us.items():
+            modules.setdefault(name, []).append(micros)
+
+    runs = [c + p for c, p in zip(totals["component"], totals["platforms"])]
+    best = min(runs)
+    print(f"Import timings over {args.runs} run(s) (best / median):")
+    for step, modules_loaded in (
+        ("component", f"{PACKAGE} + {', '.join(PRELOADED_PLATFORMS)}"),
+        ("platforms", ", ".join(ENTITY_PLATFORMS)),
+    ):
+        print(
+            f"  {step:<9}  {min(totals[step]):6.1f} / {statistics.median(totals[step]):6.1f} ms"
+            f"  ({modules_loaded})"
+        )
+    print(
+        f"  {'total':<9}  {best:6.1f} / {statistics.median(runs):6.1f} ms"
+        f"  (baseline {BASELINE_MS:g} ms, {best - BASELINE_MS:+.1f} ms)"
+    )
+
+    print("\nSlowest modules imported by the integration (self time, median):")
+    ranked = sorted(
+        ((statistics.median(values) / 1000, name) for name, values in modules.items()),
+        reverse=True,
+    )
+    for ms, name in ranked[: args.top]:
+        print(f"  {ms:7.2f} ms  {name}")
+
+    if args.budget is not None and best > args.budget:
+        print(f"\nOver budget by {best - args.budget:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""Replay a captured Jebao protocol trace against a local stand-in pump.
+
+Usage:
+    python scripts/replay_trace.py config_entry-jebao-....json [--speed 1.0]
+
+Takes a diagnostics download (or just its "trace" section) recorded with
+the jebao.trace service. A local TCP server plays the pump: every request
+it receives is answered with the frames the real pump sent back, after the
+delays seen in production. The recorded status reads and control commands
+are then re-issued the way the integration sends them: through the pump's
+token buckets (with the budgets in the download's entry options) and under
+the latency policy's adaptive deadline, re-sends and reconnects. Timeouts,
+late replies, slow acks and queueing from the field can so be reproduced
+and benchmarked offline.
+
+Needs Home Assistant and python-jebao installed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import statistics
+import sys
+import time
+from typing import Any, Optional
+
+from jebao import JebaoError, MDP20000Device
+from jebao.const import (
+    DEFAULT_TIMEOUT,
+    MSG_CONTROL_OR_EXTENDED_REQUEST,
+    MSG_DATA_REQUEST_SIMPLE,
+    MSG_LOGIN_REQUEST,
+    MSG_REQUEST_PASSCODE,
+    CommandOpcode,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+from custom_components.jebao.const import (  # noqa: E402
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_RATE,
+    CONF_POLL_BURST,
+    CONF_POLL_RATE,
+    DEFAULT_COMMAND_BURST,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_POLL_BURST,
+    DEFAULT_POLL_RATE,
+)
+from custom_components.jebao.latency import JebaoRequestPolicy  # noqa: E402
+from custom_components.jebao.throttle import JebaoThrottle  # noqa: E402
+
+FRAME_MAGIC = b"\x00\x00\x00\x03"
+# Type 0x00 frames are followed by a fixed padding frame on the wire
+EXTENDED_PADDING = bytes(129)
+
+# Answers for a login the trace did not capture (tracing started later)
+PASSCODE_RESPONSE = bytes.fromhex("000000030f00000700 0a") + b"0" * 10
+LOGIN_SUCCESS = bytes.fromhex("00000003030000 09")
+
+
+@dataclass
+class Exchange:
+    """One recorded request and what the pump sent back."""
+
+    request: bytes
+    sent_at: float
+    # (seconds after the request, frame) for each reply
+    replies: list[tuple[float, bytes]] = field(default_factory=list)
+    # Seconds after the request at which the client gave up, if it did
+    gave_up_after: Optional[float] = None
+    # Answered by the stand-in already (to a re-send of the request before)
+    served: bool = False
+
+    @property
+    def msg_type(self) -> int:
+        """Return the request's message type."""
+        return frame_type(self.request)
+
+    @property
+    def duration(self) -> float:
+        """Return how long the exchange took in production."""
+        ends = [delay for delay, _ in self.replies]
+        if self.gave_up_after is not None:
+            ends.append(self.gave_up_after)
+        return max(ends, default=0.0)
+
+
+def frame_type(frame: bytes) -> int:
+    """Return the message type of a frame (after its varint length)."""
+    index = len(FRAME_MAGIC)
+    while index < len(frame) and frame[index] & 0x80:
+        index += 1
+    index += 3  # Last length byte, then two flag bytes
+    return frame[index] if index < len(frame) else -1
+
+
+def load_trace(path: Path) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Load the frames and entry options from a diagnostics download.
+
+    A bare trace has no options; the default budgets are used then.
+    """
+    document = json.loads(path.read_text())
+    data = document.get("data", document)
+    options = data.get("entry", {}).get("options", {})
+    trace = data.get("trace", data)
+    if "frames" not in trace:
+        raise SystemExit(f"{path} contains no protocol trace")
+    if trace.get("dropped"):
+        print(
+            f"note: {trace['dropped']} older frame(s) were dropped from the ring buffer",
+            file=sys.stderr,
+        )
+    return trace["frames"], options
+
+
+def build_exchanges(frames: list[dict[str, Any]]) -> list[Exchange]:
+    """Group frames into request/reply exchanges."""
+    exchanges: list[Exchange] = []
+    for frame in frames:
+        if frame["dir"] == "tx":
+            exchanges.append(Exchange(bytes.fromhex(frame["data"]), frame["t"]))
+        elif not exchanges:
+            continue  # Replies to a request from before the buffer started
+        elif frame["dir"] == "rx":
+            exchange = exchanges[-1]
+            exchange.replies.append(
+                (frame["t"] - exchange.sent_at, bytes.fromhex(frame["data"]))
+            )
+        elif exchanges[-1].gave_up_after is None:
+            exchanges[-1].gave_up_after = frame["t"] - exchanges[-1].sent_at
+    return exchanges
+
+
+class StandInPump:
+    """TCP server that answers requests with the recorded replies."""
+
+    def __init__(self, exchanges: list[Exchange], speed: float) -> None:
+        """Initialize the stand-in."""
+        self._pending = list(exchanges)
+        self._speed = speed
+        self.mismatches = 0
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection."""
+        try:
+            while True:
+                request = await self._read_frame(reader)
+                await self._answer(request, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+        """Read one client frame (the length is a varint)."""
+        header = await reader.readexactly(len(FRAME_MAGIC))
+        length_bytes = b""
+        length = shift = 0
+        while True:
+            byte = (await reader.readexactly(1))[0]
+            length_bytes += bytes([byte])
+            length |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        return header + length_bytes + await reader.readexactly(length)
+
+    async def _answer(self, request: bytes, writer: asyncio.StreamWriter) -> None:
+        """Send the recorded replies for a request."""
+        msg_type = frame_type(request)
+        if msg_type not in (MSG_REQUEST_PASSCODE, MSG_LOGIN_REQUEST):
+            # Logins recorded mid-trace are not repeated by the client
+            while self._pending and self._pending[0].msg_type in (
+                MSG_REQUEST_PASSCODE,
+                MSG_LOGIN_REQUEST,
+            ):
+                self._pending.pop(0)
+        upcoming = self._pending[0] if self._pending else None
+
+        if upcoming is None or upcoming.msg_type != msg_type:
+            if msg_type == MSG_REQUEST_PASSCODE:
+                writer.write(PASSCODE_RESPONSE)
+                return
+            if msg_type == MSG_LOGIN_REQUEST:
+                writer.write(LOGIN_SUCCESS)
+                return
+            self.mismatches += 1
+            if upcoming is None:
+                return
+
+        exchange = self._pending.pop(0)
+        exchange.served = True
+        start = time.monotonic()
+        for delay, reply in exchange.replies:
+            await asyncio.sleep(max(0.0, start + delay * self._speed - time.monotonic()))
+            writer.write(reply)
+            if frame_type(reply) == 0x00:
+                writer.write(EXTENDED_PADDING)
+            await writer.drain()
+
+
+class ReplaySession:
+    """A stand-in pump session wrapped the way the integration wraps one.
+
+    The throttle is attached to the device's protocol exactly as for a
+    configured pump. Requests are issued one protocol call each (a device
+    method would add status reads that the trace holds as requests of
+    their own), through the latency policy.
+    """
+
+    def __init__(self, port: int, options: dict[str, Any]) -> None:
+        """Initialize session."""
+        self.device = MDP20000Device("127.0.0.1", port=port)
+        self.throttle = JebaoThrottle(
+            options.get(CONF_POLL_RATE, DEFAULT_POLL_RATE),
+            options.get(CONF_POLL_BURST, DEFAULT_POLL_BURST),
+            options.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE),
+            options.get(CONF_COMMAND_BURST, DEFAULT_COMMAND_BURST),
+        )
+        self.throttle.async_attach(self.device)
+        self.requests = JebaoRequestPolicy(self.device.connect)
+
+    @property
+    def is_connected(self) -> bool:
+        """Return whether the session is up (checked before a reconnect)."""
+        return self.device.is_connected
+
+    async def request_status(self, timeout: float = DEFAULT_TIMEOUT) -> bytes:
+        """Read the status through the poll budget."""
+        protocol = self.device._protocol  # noqa: SLF001
+        return await protocol.request_status(timeout=timeout)
+
+    async def send_control_command(
+        self, *params: int, timeout: float = DEFAULT_TIMEOUT
+    ) -> None:
+        """Send a control command through the command budget."""
+        protocol = self.device._protocol  # noqa: SLF001
+        await protocol.send_control_command(*params, timeout=timeout)
+
+    async def async_issue(self, exchange: Exchange) -> None:
+        """Re-issue a recorded request the way the integration sends it."""
+        request = exchange.request
+        if exchange.msg_type == MSG_DATA_REQUEST_SIMPLE:
+            await self.requests.async_send(self.request_status, sample=True)
+        elif exchange.msg_type == MSG_CONTROL_OR_EXTENDED_REQUEST and len(request) > 24:
+            await self.requests.async_send(
+                self.send_control_command,
+                *request[21:25],
+                # The coordinator never sends a feed start twice
+                idempotent=request[21] != CommandOpcode.START_FEED,
+            )
+        else:
+            # Anything else (e.g. pings) goes out as recorded
+            protocol = self.device._protocol  # noqa: SLF001
+            await protocol._send_raw(request)  # noqa: SLF001
+            for _ in exchange.replies:
+                await asyncio.wait_for(protocol._read_raw(), timeout=5.0)  # noqa: SLF001
+
+
+async def replay(
+    exchanges: list[Exchange], speed: float, options: dict[str, Any]
+) -> dict[str, Any]:
+    """Replay the exchanges through a wrapped session; return the results."""
+    pump = StandInPump(exchanges, speed)
+    server = await asyncio.start_server(pump.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    session = ReplaySession(port, options)
+    results: dict[str, Any] = {"errors": 0, "by_type": {}}
+    try:
+        await session.device.connect()
+        start = time.monotonic()
+        first_sent = None
+        for exchange in exchanges:
+            if exchange.msg_type in (MSG_REQUEST_PASSCODE, MSG_LOGIN_REQUEST):
+                continue  # Replayed by connect()
+            if exchange.served:
+                continue  # Answered to a re-send of the request before
+
+            # Keep the recorded spacing between requests
+            if first_sent is None:
+                first_sent = exchange.sent_at
+            due = start + (exchange.sent_at - first_sent) * speed
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+
+            sent = time.monotonic()
+            try:
+                await session.async_issue(exchange)
+            except JebaoError as err:
+                results["errors"] += 1
+                print(f"  {exchange.sent_at:10.3f}s  0x{exchange.msg_type:02x}  {err}")
+                if not session.is_connected:
+                    await session.device.connect()
+            elapsed = time.monotonic() - sent
+
+            timings = results["by_type"].setdefault(
+                f"0x{exchange.msg_type:02x}", {"recorded": [], "replayed": []}
+            )
+            timings["recorded"].append(exchange.duration)
+            timings["replayed"].append(elapsed)
+    finally:
+        session.throttle.async_detach()
+        await session.device.disconnect()
+        server.close()
+        await server.wait_closed()
+
+    results["mismatches"] = pump.mismatches
+    results["requests"] = session.requests.as_dict()
+    results["throttle"] = session.throttle.as_dict()
+    return results
+
+
+def _summary(values: list[float]) -> str:
+    """Format p50 / p95 / max of durations in milliseconds."""
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    return (
+        f"p50 {statistics.median(ordered) * 1000:7.1f}  "
+        f"p95 {p95 * 1000:7.1f}  max {ordered[-1] * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    """Run the replay from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("trace", type=Path, help="diagnostics download or trace JSON")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="scale recorded delays (0.5 = twice as fast, 0 = no delays)",
+    )
+    args = parser.parse_args()
+
+    frames, options = load_trace(args.trace)
+    exchanges = build_exchanges(frames)
+    if not exchanges:
+        raise SystemExit("The trace contains no requests")
+
+    print(f"Replaying {len(exchanges)} exchange(s) at speed {args.speed:g}")
+    results = asyncio.run(replay(exchanges, args.speed, options))
+
+    for msg_type, timings in sorted(results["by_type"].items()):
+        print(f"type {msg_type}: {len(timings['recorded'])} request(s)")
+        print(f"  recorded  {_summary(timings['recorded'])}")
+        print(f"  replayed  {_summary(timings['replayed'])}")
+    print(f"errors: {results['errors']}  out-of-order requests: {results['mismatches']}")
+
+    requests = results["requests"]
+    print(
+        f"deadline {requests['deadline']:.2f} s  timeouts {requests['timeouts']}  "
+        f"re-sent {requests['retries']} ({requests['retries_denied']} denied)  "
+        f"reconnects {requests['reconnects']}"
+    )
+    for name, bucket in results["throttle"].items():
+        print(
+            f"{name}: {bucket['throttled']} of {bucket['acquired']} request(s) queued, "
+            f"longest wait {bucket['wait_max'] * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()